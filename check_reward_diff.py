@@ -2,8 +2,29 @@
 # this program can calculate how many simulation results have different judge rewards
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Streaming is only worth it with the C backend; the pure-Python one is slower
+# than a full orjson parse, so fall back to loading the document in that case.
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    ijson = None
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+_SIM_PREFIX = "simulations.item"
+_TASK_ID_PREFIX = "simulations.item.task_id"
+_SIM_ID_PREFIX = "simulations.item.id"
+_VOTE_PREFIX = "simulations.item.reward_info.info.judge_records.item.vote"
 
 
 def _iter_simulations(data: dict) -> Iterable[dict]:
@@ -14,40 +35,97 @@ def _iter_simulations(data: dict) -> Iterable[dict]:
                 yield sim
 
 
-def _extract_votes(sim: dict) -> list[int]:
+def _extract_votes(sim: dict) -> Iterable[int]:
     reward_info = sim.get("reward_info") or {}
     info = reward_info.get("info") or {}
     judge_records = info.get("judge_records") or []
-    votes: list[int] = []
     if isinstance(judge_records, list):
         for record in judge_records:
             if not isinstance(record, dict):
                 continue
             if "vote" in record:
                 try:
-                    votes.append(int(record["vote"]))
+                    yield int(record["vote"])
                 except (TypeError, ValueError):
                     continue
-    return votes
 
 
-def _is_inconsistent(votes: list[int]) -> bool:
-    if not votes:
-        return False
-    unique_votes = {vote for vote in votes if vote in {0, 1}}
-    return len(unique_votes) > 1
+def _is_inconsistent(votes: Iterable[int]) -> bool:
+    # bit 0 marks a seen 0 vote, bit 1 a seen 1 vote; stop once both are set.
+    seen = 0
+    for vote in votes:
+        if vote == 0:
+            seen |= 1
+        elif vote == 1:
+            seen |= 2
+        else:
+            continue
+        if seen == 3:
+            return True
+    return False
+
+
+def _load_json(path: Path) -> dict:
+    if orjson is not None:
+        raw = path.read_bytes()
+        if raw.startswith(_UTF8_BOM):
+            raw = raw[len(_UTF8_BOM):]
+        return orjson.loads(raw)
+    with path.open("r", encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def _stream_task_flags(path: Path) -> Iterable[tuple[Optional[str], bool]]:
+    """Yield (task_id, inconsistent) per simulation without building the full
+    JSON tree. Votes are checked as they are parsed, the same way as
+    _is_inconsistent, and ignored once the simulation is known to disagree.
+    """
+    with path.open("rb") as f:
+        if f.read(len(_UTF8_BOM)) != _UTF8_BOM:
+            f.seek(0)
+        task_id = sim_id = None
+        seen = 0
+        for prefix, event, value in ijson.parse(f):
+            if prefix == _VOTE_PREFIX:
+                if seen == 3:
+                    continue
+                try:
+                    vote = int(value)
+                except (TypeError, ValueError):
+                    continue
+                if vote == 0:
+                    seen |= 1
+                elif vote == 1:
+                    seen |= 2
+            elif prefix == _TASK_ID_PREFIX:
+                task_id = value
+            elif prefix == _SIM_ID_PREFIX:
+                sim_id = value
+            elif prefix == _SIM_PREFIX:
+                if event == "start_map":
+                    task_id = sim_id = None
+                    seen = 0
+                elif event == "end_map":
+                    yield task_id or sim_id, seen == 3
+
+
+def _iter_task_flags(path: Path) -> Iterable[tuple[Optional[str], bool]]:
+    if ijson is not None:
+        yield from _stream_task_flags(path)
+        return
+    data = _load_json(path)
+    for sim in _iter_simulations(data):
+        yield sim.get("task_id") or sim.get("id"), _is_inconsistent(_extract_votes(sim))
 
 
-def _scan_file(path: Path, show: bool) -> int:
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+def _scan_file(path: Path) -> tuple[Path, list]:
+    inconsistent = [
+        task_id for task_id, flagged in _iter_task_flags(path) if flagged
+    ]
+    return path, inconsistent
 
-    inconsistent = []
-    for sim in _iter_simulations(data):
-        votes = _extract_votes(sim)
-        if _is_inconsistent(votes):
-            inconsistent.append(sim.get("task_id") or sim.get("id"))
 
+def _report(path: Path, inconsistent: list, show: bool) -> int:
     print(f"{path}: inconsistent_tasks={len(inconsistent)}")
     if show and inconsistent:
         for task_id in inconsistent:
@@ -56,9 +134,27 @@ def _scan_file(path: Path, show: bool) -> int:
 
 
 def _iter_json_files(directory: Path, pattern: str) -> Iterable[Path]:
-    for path in sorted(directory.rglob(pattern)):
-        if path.is_file():
-            yield path
+    if "/" in pattern or os.sep in pattern or "**" in pattern:
+        # Only plain file-name patterns can be matched entry by entry; leave
+        # anything with a directory part to rglob's own matching.
+        for path in sorted(directory.rglob(pattern)):
+            if path.is_file():
+                yield path
+        return
+    yield from _scan_json_files(directory, pattern)
+
+
+def _scan_json_files(directory: Path, pattern: str) -> Iterable[Path]:
+    # os.scandir exposes cached d_type info, so unlike rglob + is_file() no
+    # extra stat() is needed per entry. Sorting per directory keeps the same
+    # order as sorted(rglob(...)) without collecting the whole tree first.
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scan_json_files(Path(entry.path), pattern)
+        elif entry.is_file() and fnmatch(entry.name, pattern):
+            yield Path(entry.path)
 
 
 def main() -> None:
@@ -76,16 +172,30 @@ def main() -> None:
     parser.add_argument(
         "--show", action="store_true", help="Show task IDs with inconsistent votes"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes for --dir (default: CPU count)",
+    )
     args = parser.parse_args()
 
     if args.path:
-        _scan_file(args.path, args.show)
+        _report(*_scan_file(args.path), args.show)
         return
 
     total = 0
     files = list(_iter_json_files(args.dir, args.pattern))
-    for path in files:
-        total += _scan_file(path, args.show)
+    if len(files) > 1 and args.workers != 1:
+        workers = args.workers or os.cpu_count() or 1
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields in submission order, so output stays in file order.
+            results = list(executor.map(_scan_file, files, chunksize=chunksize))
+    else:
+        results = [_scan_file(path) for path in files]
+    for path, inconsistent in results:
+        total += _report(path, inconsistent, args.show)
     print(f"total_inconsistent_tasks={total}")
 
 
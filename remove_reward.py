@@ -1,20 +1,253 @@
 import argparse
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from json.encoder import encode_basestring
 from pathlib import Path
+from typing import BinaryIO
 
-from vita.data_model.simulation import Results
+import pydantic_core
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
-def _read_text_with_fallback(path: Path) -> str:
-    raw_text = None
-    for enc in ("utf-8-sig", "utf-8", "gb18030"):
-        try:
-            raw_text = path.read_text(encoding=enc)
-            break
-        except UnicodeDecodeError:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The event-driven rewrite only pays off with ijson's C backend; with the
+# pure-Python one we always take the in-memory path.
+try:
+    import ijson.backends.yajl2_c as ijson
+    from ijson.common import IncompleteJSONError
+except ImportError:
+    ijson = None
+
+# Files at least this large are rewritten as a stream of parse events instead
+# of being loaded whole. Below it a single orjson parse is faster and the
+# memory footprint is not a concern.
+_STREAM_MIN_BYTES = 256 * 1024 * 1024
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+_SIM_PREFIX = "simulations.item"
+# Results.save writes model_dump_json(indent=4); every path keeps that layout
+# so that rewritten files only differ from untouched ones in reward_info.
+_INDENT = "    "
+
+
+def _read_utf8_bytes(path: Path) -> bytes:
+    """Read the file once and return it as UTF-8 bytes without a BOM.
+
+    Results are normally UTF-8 (optionally with a BOM); older files saved on
+    Windows may be gb18030 and are transcoded.
+    """
+    raw = path.read_bytes()
+    if raw.startswith(_UTF8_BOM):
+        return raw[len(_UTF8_BOM):]
+    try:
+        raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("gb18030").encode("utf-8")
+    return raw
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(data) -> bytes:
+    # pydantic-core is the serializer behind Results.save, so floats are
+    # spelled as in the input (1e-7, not json's 1e-07).
+    return pydantic_core.to_json(data, indent=4)
+
+
+@contextmanager
+def _open_atomic(path: Path):
+    # Same temp-file + os.replace dance as Results.save, so an interrupted run
+    # never leaves a truncated results file behind.
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=str(path.parent),
+            prefix=f"{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            tmp_name = f.name
+            yield f
+            f.flush()
+            try:
+                os.fsync(f.fileno())
+            except OSError:
+                pass
+
+        os.replace(tmp_name, path)
+    finally:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+
+
+def _encode_scalar(event: str, value) -> str:
+    if event == "string" or event == "map_key":
+        return encode_basestring(value)
+    if event == "number":
+        if isinstance(value, float):
+            return pydantic_core.to_json(value).decode()
+        return str(value)
+    if event == "boolean":
+        return "true" if value else "false"
+    return "null"
+
+
+def _stream_strip_rewards(src: BinaryIO, dst: BinaryIO) -> None:
+    """Copy a results document event by event, writing null for every
+    simulations[*].reward_info subtree, or adding one where a simulation has
+    none. Output is byte for byte what the in-memory path writes.
+    """
+    # Items written so far in each open container, innermost last.
+    counts: list[int] = []
+    pending_key = None
+    skip_depth = -1
+    saw_simulations = False
+    saw_reward = False
+    out: list[str] = []
+
+    def begin_value() -> None:
+        nonlocal pending_key
+        if not counts:
+            return
+        out.append(",\n" if counts[-1] else "\n")
+        out.append(_INDENT * len(counts))
+        counts[-1] += 1
+        if pending_key is not None:
+            out.append(pending_key)
+            out.append(": ")
+            pending_key = None
+
+    for prefix, event, value in ijson.parse(src, use_float=True):
+        if skip_depth >= 0:
+            if event == "start_map" or event == "start_array":
+                skip_depth += 1
+            elif event == "end_map" or event == "end_array":
+                skip_depth -= 1
+            if skip_depth == 0:
+                skip_depth = -1
             continue
-    if raw_text is None:
-        raw_text = path.read_text()
-    return raw_text
+
+        if prefix == _SIM_PREFIX and event != "map_key":
+            if event == "start_map":
+                saw_reward = False
+            elif event != "end_map":
+                # A simulation that is not an object; msgspec rejects it too.
+                raise ValueError("Not a simulation results file")
+
+        if event == "map_key":
+            pending_key = encode_basestring(value)
+            if prefix == _SIM_PREFIX and value == "reward_info":
+                saw_reward = True
+                begin_value()
+                out.append("null")
+                skip_depth = 0
+        elif event == "start_map" or event == "start_array":
+            if prefix == "simulations" and event == "start_array":
+                saw_simulations = True
+            begin_value()
+            out.append("{" if event == "start_map" else "[")
+            counts.append(0)
+        elif event == "end_map" or event == "end_array":
+            if prefix == _SIM_PREFIX and not saw_reward:
+                # Same as assigning sim["reward_info"] on the other paths.
+                pending_key = '"reward_info"'
+                begin_value()
+                out.append("null")
+            if counts.pop():
+                out.append("\n")
+                out.append(_INDENT * len(counts))
+            out.append("}" if event == "end_map" else "]")
+        else:
+            begin_value()
+            out.append(_encode_scalar(event, value))
+
+        if len(out) >= 4096:
+            dst.write("".join(out).encode("utf-8"))
+            out.clear()
+
+    dst.write("".join(out).encode("utf-8"))
+    if not saw_simulations:
+        raise ValueError("Not a simulation results file")
+
+
+def _strip_rewards_raw(data: bytes) -> bytes:
+    """Null out reward_info using msgspec, decoding only two levels of the tree.
+
+    Everything below the top-level keys and the per-simulation keys stays a
+    msgspec.Raw slice of the input, so tasks and message trajectories are
+    never turned into Python objects. Plain dicts are used rather than Structs
+    so that fields unknown to this script are carried through untouched.
+    """
+    try:
+        results = msgspec.json.decode(data, type=dict[str, msgspec.Raw])
+        simulations = msgspec.json.decode(
+            results["simulations"], type=list[dict[str, msgspec.Raw]]
+        )
+    except (KeyError, msgspec.ValidationError) as e:
+        raise ValueError("Not a simulation results file") from e
+
+    null = msgspec.Raw(b"null")
+    for sim in simulations:
+        sim["reward_info"] = null
+    results["simulations"] = msgspec.Raw(msgspec.json.encode(simulations))
+    return msgspec.json.format(msgspec.json.encode(results), indent=4)
+
+
+def _strip_rewards_in_memory(in_path: Path, out_path: Path) -> None:
+    if msgspec is not None:
+        try:
+            payload = _strip_rewards_raw(_read_utf8_bytes(in_path))
+        except ValueError as e:
+            raise ValueError(f"{e}: {in_path}") from e
+        with _open_atomic(out_path) as f:
+            f.write(payload)
+        return
+
+    results = _loads(_read_utf8_bytes(in_path))
+    simulations = results.get("simulations") if isinstance(results, dict) else None
+    if not isinstance(simulations, list) or not all(
+        isinstance(sim, dict) for sim in simulations
+    ):
+        raise ValueError(f"Not a simulation results file: {in_path}")
+
+    for sim in simulations:
+        sim["reward_info"] = None
+
+    with _open_atomic(out_path) as f:
+        f.write(_dumps(results))
+
+
+def _strip_rewards_streaming(in_path: Path, out_path: Path) -> bool:
+    """Stream-rewrite in_path; returns False if yajl cannot parse the input,
+    i.e. it is not UTF-8 (e.g. a gb18030 file) or holds integers beyond 64
+    bits, in which case nothing is written."""
+    try:
+        with in_path.open("rb") as src, _open_atomic(out_path) as dst:
+            if src.read(len(_UTF8_BOM)) != _UTF8_BOM:
+                src.seek(0)
+            _stream_strip_rewards(src, dst)
+    except IncompleteJSONError:
+        return False
+    except ValueError as e:
+        raise ValueError(f"{e}: {in_path}") from e
+    return True
 
 
 def main() -> int:
@@ -30,13 +263,14 @@ def main() -> int:
 
     out_path = Path(args.output) if args.output is not None else in_path
 
-    results = Results.model_validate_json(_read_text_with_fallback(in_path))
-
-    for sim in results.simulations:
-        sim.reward_info = None
-
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    results.save(out_path)
+
+    # Work on the plain JSON tree: validating every message into Pydantic
+    # models just to null out one field per simulation is the bulk of the cost.
+    if ijson is not None and in_path.stat().st_size >= _STREAM_MIN_BYTES:
+        if _strip_rewards_streaming(in_path, out_path):
+            return 0
+    _strip_rewards_in_memory(in_path, out_path)
     return 0
 
 
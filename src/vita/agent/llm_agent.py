@@ -1,4 +1,5 @@
-from copy import deepcopy
+from functools import lru_cache
+from itertools import chain
 from typing import List, Optional
 
 from loguru import logger
@@ -22,6 +23,16 @@ from vita.utils.utils import get_now, get_weekday
 from vita.prompts import get_prompts
 
 
+@lru_cache(maxsize=256)
+def _make_system_message(content: str) -> SystemMessage:
+    """
+    Get a shared SystemMessage for a system prompt.
+    System messages are never mutated by the agents, so one instance per
+    prompt can back every state built from it.
+    """
+    return SystemMessage(role="system", content=content)
+
+
 class LLMAgentState(BaseModel):
     """The state of the agent."""
 
@@ -48,15 +59,15 @@ class LLMAgent(LocalAgent[LLMAgentState]):
         """
         super().__init__(tools=tools, domain_policy=domain_policy)
         self.llm = llm
-        self.llm_args = deepcopy(llm_args) if llm_args is not None else {}
+        self.llm_args = dict(llm_args) if llm_args is not None else {}
         self.time = time + " " + get_weekday(time, language)
+        # The simulation time is fixed for the agent's lifetime, so format once.
+        self._system_prompt = self.domain_policy.format(time=self.time)
 
     @property
     def system_prompt(self) -> str:
         if self.time is not None:
-            return self.domain_policy.format(
-                time=self.time
-            )
+            return self._system_prompt
         return self.domain_policy.format(
             time=get_now("%Y-%m-%d %H:%M:%S")
         )
@@ -79,7 +90,7 @@ class LLMAgent(LocalAgent[LLMAgentState]):
         )
         
         return LLMAgentState(
-            system_messages=[SystemMessage(role="system", content=self.system_prompt)],
+            system_messages=[_make_system_message(self.system_prompt)],
             messages=message_history,
         )
 
@@ -94,17 +105,13 @@ class LLMAgent(LocalAgent[LLMAgentState]):
         else:
             state.messages.append(message)
         
-        messages = state.system_messages + state.messages
-            
-        llm_args = dict(self.llm_args)
-        llm_args.pop("enable_prompt_caching", None)
+        messages = chain(state.system_messages, state.messages)
             
         assistant_message = generate(
             model=self.llm,
             tools=self.tools,
             messages=messages,
-            **llm_args,
-            enable_prompt_caching=True,
+            **{**self.llm_args, "enable_prompt_caching": True},
         )
         state.messages.append(assistant_message)
             
@@ -143,17 +150,16 @@ class LLMSoloAgent(LocalAgent[LLMAgentState]):
         """
         super().__init__(tools=tools, domain_policy=domain_policy)
         self.llm = llm
-        self.llm_args = deepcopy(llm_args) if llm_args is not None else {}
+        self.llm_args = dict(llm_args) if llm_args is not None else {}
         self.time = time + " " + get_weekday(time, language)
+        self._system_prompt_template = get_prompts().solo_agent_system_prompt
+        self._system_prompt = self._system_prompt_template.format(time=self.time)
 
     @property
     def system_prompt(self) -> str:
-        prompts = get_prompts()
         if self.time is not None:
-            return prompts.solo_agent_system_prompt.format(
-                time=self.time
-            )
-        return prompts.solo_agent_system_prompt.format(
+            return self._system_prompt
+        return self._system_prompt_template.format(
             time=get_now("%Y-%m-%d %H:%M:%S")
         )
 
@@ -181,7 +187,7 @@ class LLMSoloAgent(LocalAgent[LLMAgentState]):
             "Message history must contain only AssistantMessage, UserMessage, or ToolMessage to Agent."
         )
         return LLMAgentState(
-            system_messages=[SystemMessage(role="system", content=self.system_prompt)],
+            system_messages=[_make_system_message(self.system_prompt)],
             messages=message_history,
         )
 
@@ -199,17 +205,14 @@ class LLMSoloAgent(LocalAgent[LLMAgentState]):
             assert len(state.messages) == 0, "Message history should be empty"
         else:
             state.messages.append(message)
-        messages = state.system_messages + state.messages
+        messages = chain(state.system_messages, state.messages)
 
-        llm_args = dict(self.llm_args)
-        llm_args.pop("enable_prompt_caching", None)
         assistant_message = generate(
             model=self.llm,
             tools=self.tools,
             messages=messages,
             tool_choice="auto",
-            **llm_args,
-            enable_prompt_caching=True,
+            **{**self.llm_args, "enable_prompt_caching": True},
         )
         if not assistant_message.is_tool_call() and not self.is_stop(assistant_message):
             raise ValueError("LLMSoloAgent only supports tool calls before ###STOP###.")
@@ -1,7 +1,19 @@
+import hashlib
 import os
+import pickle
+import re
 import yaml
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
 
+from loguru import logger
+
+try:
+    from platformdirs import user_cache_dir
+except ImportError:
+    user_cache_dir = None
+
 _models_yaml_path = Path(__file__).parent / "models.yaml"
 if os.environ.get("VITA_MODEL_CONFIG_PATH", None):
     _models_yaml_path = Path(os.environ.get("VITA_MODEL_CONFIG_PATH"))
@@ -21,15 +33,28 @@ if not os.path.exists(str(_evaluators_yaml_path)):
 
 DEFAULT_LLM_TIMEOUT = 600
 
+# libyaml-backed loader when available; the configs only use plain mappings/lists.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_ENV_VAR_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
 
 def _deep_merge_dict(base_dict: dict, override_dict: dict) -> dict:
+    # Only the nested dicts that the override actually touches are copied;
+    # everything else is shared with base_dict.
     result = base_dict.copy()
 
-    for key, value in override_dict.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge_dict(result[key], value)
-        else:
-            result[key] = value
+    pending = [(result, override_dict)]
+    while pending:
+        target, override = pending.pop()
+        for key, value in override.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = current.copy()
+                target[key] = merged
+                pending.append((merged, value))
+            else:
+                target[key] = value
 
     return result
 
@@ -40,12 +65,71 @@ def _resolve_env_vars(obj):
     if isinstance(obj, list):
         return [_resolve_env_vars(v) for v in obj]
     if isinstance(obj, str):
-        for key, val in os.environ.items():
-            obj = obj.replace(f"${{{key}}}", val)
-        return obj
+        # Unset variables are left as the literal ${NAME} placeholder.
+        return _ENV_VAR_PATTERN.sub(
+            lambda m: os.environ.get(m.group(1), m.group(0)), obj
+        )
     return obj
 
 
+def _yaml_cache_path(path: Path) -> Path:
+    """Per-user cache file for the parse of the config file at path."""
+    if user_cache_dir is not None:
+        cache_dir = Path(user_cache_dir("vita"))
+    else:
+        cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "vita"
+    # Configs from different installs or VITA_*_CONFIG_PATH overrides share
+    # the directory, so the file name includes a hash of the config's path.
+    path_hash = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{path.name}.{path_hash}.pkl"
+
+
+def _load_yaml_config(path: Path):
+    """Load a YAML config file, reusing a pickled parse while the file is unchanged.
+
+    The cache stores the raw parse (before ${VAR} resolution) in the user's
+    cache directory rather than next to the YAML file, which may sit in a
+    read-only or shared install, and is keyed on the file's mtime and size.
+    Failing to read or write the cache is never an error; we just fall back
+    to parsing the YAML.
+    """
+    path = Path(path)
+    stat = path.stat()
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    try:
+        cache_path = _yaml_cache_path(path)
+    except RuntimeError:
+        # No home directory to cache in.
+        cache_path = None
+
+    if cache_path is not None:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, data = pickle.load(f)
+            if cached_key == cache_key:
+                return data
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            pass
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+
+    if cache_path is None:
+        return data
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((cache_key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return data
+
+
 def _normalize_api_config(cfg: dict) -> dict:
     cfg = _resolve_env_vars(cfg)
     if not isinstance(cfg, dict):
@@ -64,56 +148,77 @@ def _normalize_api_config(cfg: dict) -> dict:
     return cfg
 
 
-try:
-    with open(_models_yaml_path, 'r', encoding='utf-8') as f:
-        models_config_yaml = yaml.load(f, Loader=yaml.FullLoader)
-
-    default_model_config = models_config_yaml.get('default', {})
-
-    models = {"default": default_model_config}
-    for model in models_config_yaml.get('models', []):
-        model_name = model['name']
-        merged_config = _deep_merge_dict(default_model_config, model)
-        models[model_name] = _normalize_api_config(merged_config)
-
-    _available_model_names = [k for k in models.keys() if k != "default"]
-
-    print(f"Available models: {list(models.keys())}")
-
-except FileNotFoundError:
-    print(f"Warning: models.yaml not found at {_models_yaml_path}")
-    models = {}
-    _available_model_names = []
-except Exception as e:
-    print(f"Error loading models.yaml: {e}")
-    models = {}
-    _available_model_names = []
-
-
-try:
-    with open(_evaluators_yaml_path, 'r', encoding='utf-8') as f:
-        evaluators_config_yaml = yaml.load(f, Loader=yaml.FullLoader)
+def _read_model_entries(path: Path, label: str) -> dict:
+    """Read a models YAML file into {name: (default_config, model_config)}.
+
+    The "default" entry maps to (default_config, None). Problems with the file
+    are logged and yield no entries, so one bad file does not break the other.
+    """
+    try:
+        config_yaml = _load_yaml_config(path)
+        default_config = config_yaml.get('default', {})
+        entries = {"default": (default_config, None)}
+        for model in config_yaml.get('models', []):
+            entries[model['name']] = (default_config, model)
+        return entries
+    except FileNotFoundError:
+        logger.warning(f"{label} not found at {path}")
+    except Exception as e:
+        logger.error(f"Error loading {label}: {e}")
+    return {}
+
+
+@lru_cache(maxsize=None)
+def _load_evaluator_entries() -> dict:
+    return _read_model_entries(_evaluators_yaml_path, "evaluators.yaml")
+
+
+@lru_cache(maxsize=None)
+def _load_model_entries() -> dict:
+    entries = _read_model_entries(_models_yaml_path, "models.yaml")
+    logger.debug(f"Available models: {list(entries.keys())}")
+    # Evaluator definitions override models of the same name.
+    entries.update(_load_evaluator_entries())
+    return entries
+
+
+class _ModelConfigs(Mapping):
+    """Model name -> API config, loaded and merged on first use.
+
+    Nothing is read from disk until the mapping is first accessed, and each
+    model is only merged with the defaults when it is actually looked up, so
+    importing vita.config stays cheap for scripts that never touch an LLM.
+    """
+
+    def __init__(self, load_entries):
+        self._load_entries = load_entries
+        self._resolved = {}
+
+    def __getitem__(self, name: str) -> dict:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        default_config, model = self._load_entries()[name]
+        if model is None:
+            config = default_config
+        else:
+            config = _normalize_api_config(_deep_merge_dict(default_config, model))
+        self._resolved[name] = config
+        return config
 
-    default_evaluator_config = evaluators_config_yaml.get('default', {})
+    def __iter__(self):
+        return iter(self._load_entries())
 
-    evaluators = {"default": default_evaluator_config}
-    for model in evaluators_config_yaml.get('models', []):
-        model_name = model['name']
-        merged_config = _deep_merge_dict(default_evaluator_config, model)
-        evaluators[model_name] = _normalize_api_config(merged_config)
+    def __len__(self) -> int:
+        return len(self._load_entries())
 
-    _available_evaluator_names = [k for k in evaluators.keys() if k != "default"]
+    def __contains__(self, name) -> bool:
+        return name in self._load_entries()
 
-except FileNotFoundError:
-    print(f"Warning: evaluators.yaml not found at {_evaluators_yaml_path}")
-    evaluators = {}
-    _available_evaluator_names = []
-except Exception as e:
-    print(f"Error loading evaluators.yaml: {e}")
-    evaluators = {}
-    _available_evaluator_names = []
 
-models.update(evaluators)
+models = _ModelConfigs(_load_model_entries)
+evaluators = _ModelConfigs(_load_evaluator_entries)
 
 # SIMULATION
 DEFAULT_MAX_STEPS = 120
@@ -1,9 +1,8 @@
-import json
 from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
-from vita.utils.utils import get_now
+from vita.utils.utils import dumps_pretty_json, get_now
 
 SystemRole = Literal["system"]
 UserRole = Literal["user"]
@@ -64,7 +63,7 @@ class ToolCall(BaseModel):
         if self.id:
             lines.append(f"id: {self.id}")
         lines.append(f"name: {self.name}")
-        lines.append(f"arguments:\n{json.dumps(self.arguments, indent=2, ensure_ascii=False)}")
+        lines.append(f"arguments:\n{dumps_pretty_json(self.arguments)}")
         return "\n".join(lines)
 
     def __eq__(self, other: object) -> bool:
@@ -360,7 +360,7 @@ class Results(BaseModel):
 
     @classmethod
     def load(cls, path: Path) -> "Results":
-        with open(path, "r") as f:
+        with open(path, "rb") as f:
             return cls.model_validate_json(f.read())
 
     def save(self, path: Path) -> None:
@@ -1,14 +1,38 @@
-import json
-import textwrap
+import os
 import uuid
+import weakref
 from enum import Enum
-from typing import Optional, Dict, Union, ClassVar, List, Any, Literal, Tuple
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Union, ClassVar, List, Any, Literal, Tuple, Callable, MutableMapping
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 from typing_extensions import Annotated
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from vita.data_model.message import Message, ToolCall, ToolRequestor
 from vita.data_model.thread_safe_base import ThreadSafeBase
+from vita.utils.utils import dumps_pretty_json
+
+# Marks an argument absent from one side of compare_with_tool_call.
+_MISSING = object()
+
+# For value objects that are never modified after validation.
+_FROZEN_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+
+def _indent(text: str, prefix: str = "\t") -> str:
+    """
+    Same result as textwrap.indent(text, prefix), without its per-line
+    predicate call and generator.
+    """
+    return "".join(
+        [prefix + line if line.strip() else line for line in text.splitlines(True)]
+    )
 
 
 class Action(BaseModel):
@@ -26,6 +50,8 @@ class Action(BaseModel):
     If compare_args is None, will check all the arguments.
     """
 
+    model_config = _FROZEN_CONFIG
+
     action_id: str = Field(
         description="The unique identifier for the action within a scenario."
     )
@@ -43,14 +69,18 @@ class Action(BaseModel):
         default=None,
     )
 
+    @cached_property
+    def _pretty_arguments(self) -> str:
+        return dumps_pretty_json(self.arguments)
+
     def __str__(self) -> str:
         lines = []
         lines.append(f"Action ID: {self.action_id}")
         lines.append(f"Requestor: {self.requestor}")
         lines.append(f"Name: {self.name}")
-        lines.append(f"Arguments:\n{json.dumps(self.arguments, indent=2, ensure_ascii=False)}")
+        lines.append(f"Arguments:\n{self._pretty_arguments}")
         if self.info is not None:
-            lines.append(f"Info:\n{textwrap.indent(self.info, '    ')}")
+            lines.append(f"Info:\n{_indent(self.info, '    ')}")
         return "\n".join(lines)
 
     def get_func_format(self) -> str:
@@ -70,15 +100,18 @@ class Action(BaseModel):
         """
         if self.name != tool_call.name:
             return False
+        tool_args = tool_call.arguments
+        action_args = self.arguments
         if self.compare_args is None:
-            compare_args = tool_call.arguments.keys()
+            compare_args = tool_args.keys()
         else:
             compare_args = self.compare_args
-        if len(compare_args) == 0:
-            return True
-        tool_args = {k: v for k, v in tool_call.arguments.items() if k in compare_args}
-        action_args = {k: v for k, v in self.arguments.items() if k in compare_args}
-        return tool_args == action_args
+        for k in compare_args:
+            tool_value = tool_args.get(k, _MISSING)
+            action_value = action_args.get(k, _MISSING)
+            if tool_value is not action_value and tool_value != action_value:
+                return False
+        return True
 
 
 class EnvFunctionCall(BaseModel):
@@ -86,6 +119,8 @@ class EnvFunctionCall(BaseModel):
     A function call on the agent or user environment.
     """
 
+    model_config = _FROZEN_CONFIG
+
     env_type: Annotated[
         ToolRequestor,
         Field(description="The type of environment to call the function on."),
@@ -95,11 +130,15 @@ class EnvFunctionCall(BaseModel):
         dict, Field(description="The arguments to pass to the function.")
     ]
 
+    @cached_property
+    def _pretty_arguments(self) -> str:
+        return dumps_pretty_json(self.arguments)
+
     def __str__(self) -> str:
         lines = []
         lines.append(f"Env Type: {self.env_type}")
         lines.append(f"Func Name: {self.func_name}")
-        lines.append(f"Arguments:\n{json.dumps(self.arguments, indent=2, ensure_ascii=False)}")
+        lines.append(f"Arguments:\n{self._pretty_arguments}")
         return "\n".join(lines)
 
 
@@ -128,6 +167,9 @@ class UserScenario(BaseModel):
     """
     User scenario. All the information that will be sent to the user simulator.
     """
+
+    model_config = ConfigDict(extra="ignore")
+
     user_profile: Annotated[
         Dict[str, Union[Dict, str, List]],
         Field(
@@ -138,14 +180,14 @@ class UserScenario(BaseModel):
     def __str__(self) -> str:
         lines = []
         lines.append("User Profile:")
-        lines.append(textwrap.indent(str(self.user_profile), "\t"))
+        lines.append(_indent(str(self.user_profile)))
         lines.append("User Historical Behaviors:")
         return "\n".join(lines)
 
 
     @classmethod
     def from_json(cls, json_data):
-        if isinstance(json_data, str):
+        if isinstance(json_data, (str, bytes)):
             obj = cls.model_validate_json(json_data)
         else:
             obj = cls.model_validate(json_data)
@@ -178,12 +220,12 @@ class EvaluationCriteria(BaseModel):
         if self.expected_states is not None:
             lines.append("Expected States:")
             lines.extend(
-                [textwrap.indent(str(state), "\t") for state in self.expected_states]
+                [_indent(str(state)) for state in self.expected_states]
             )
         if self.overall_rubrics is not None:
             lines.append("Overall Rubrics:")
             lines.extend(
-                [textwrap.indent(rubric, "\t") for rubric in self.overall_rubrics]
+                [_indent(rubric) for rubric in self.overall_rubrics]
             )
         return "\n".join(lines)
 
@@ -237,11 +279,11 @@ class Task(BaseModel):
         lines = []
         lines.append(f"ID: {self.id}")
         lines.append("User Scenario:")
-        lines.append(textwrap.indent(str(self.user_scenario), "\t"))
+        lines.append(_indent(str(self.user_scenario)))
 
         if self.evaluation_criteria is not None:
             lines.append("Evaluation Criteria:")
-            lines.append(textwrap.indent(str(self.evaluation_criteria), "\t"))
+            lines.append(_indent(str(self.evaluation_criteria)))
         return "\n".join(lines)
 
 
@@ -255,6 +297,9 @@ def make_task_id() -> str:
 def make_task(
         user_instructions: str,
         eval_criteria: EvaluationCriteria,
+        domain: str = "",
+        environment: Optional[dict] = None,
+        instructions: str = "",
 ) -> Task:
     """
     Make a task from a user instruction and an evaluation criteria.
@@ -262,11 +307,13 @@ def make_task(
 
     user_scenario = UserScenario(
         user_profile={"instructions": user_instructions},
-        user_historical_behaviors={}
     )
     return Task(
         id=make_task_id(),
+        domain=domain,
+        environment=environment if environment is not None else {},
         user_scenario=user_scenario,
+        instructions=instructions,
         evaluation_criteria=eval_criteria,
     )
 
@@ -274,17 +321,20 @@ def make_task(
 class Location(BaseModel, ThreadSafeBase["Location"]):
     """Represents a physical address"""
 
+    model_config = _FROZEN_CONFIG
+
     address: str = Field(description="Primary address line")
     longitude: float = Field(description="longitude")
     latitude: float = Field(description="latitude")
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def _register(self):
         self.register_instance()
+        return self
 
     @classmethod
     def from_json(cls, json_data):
-        if isinstance(json_data, str):
+        if isinstance(json_data, (str, bytes)):
             obj = cls.model_validate_json(json_data)
         else:
             obj = cls.model_validate(json_data)
@@ -319,16 +369,19 @@ OrderType = Literal["delivery", "instore", "hotel", "attraction", "flight", "tra
 class StoreBaseModel(BaseModel, ThreadSafeBase["StoreBaseModel"]):
     """Represents a store with its variants"""
 
+    # Stores live in their DB; the registry must not keep old DBs alive.
+    _registry_factory: ClassVar[Callable[[], MutableMapping]] = weakref.WeakValueDictionary
+
     store_id: Optional[str] = Field(default="", description="ID of the store")
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def _register(self):
         self.register_instance()
-        self.register_polymorphic_instance(StoreBaseModel)
+        return self
 
     @classmethod
     def from_json(cls, json_data):
-        if isinstance(json_data, str):
+        if isinstance(json_data, (str, bytes)):
             obj = cls.model_validate_json(json_data)
         else:
             obj = cls.model_validate(json_data)
@@ -351,18 +404,22 @@ class StoreBaseModel(BaseModel, ThreadSafeBase["StoreBaseModel"]):
 
 class ProductBaseModel(BaseModel, ThreadSafeBase["ProductBaseModel"]):
     """Represents a product with its details"""
+
+    # Products live in their store or order; see StoreBaseModel.
+    _registry_factory: ClassVar[Callable[[], MutableMapping]] = weakref.WeakValueDictionary
+
     product_id: str = Field(default="", description="Unique identifier for the product")
     price: float = Field(default=0.0, description="Price of the product")
     quantity: Optional[int] = Field(default=0, description="Quantity of the product")
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def _register(self):
         self.register_instance()
-        self.register_polymorphic_instance(ProductBaseModel)
+        return self
 
     @classmethod
     def from_json(cls, json_data):
-        if isinstance(json_data, str):
+        if isinstance(json_data, (str, bytes)):
             obj = cls.model_validate_json(json_data)
         else:
             obj = cls.model_validate(json_data)
@@ -399,7 +456,7 @@ class Order(BaseModel):
     create_time: str = Field(default="", description="Creation time of the order")
     update_time: str = Field(default="", description="Update time of the order")
     status: OrderStatus = Field(default="unpaid", description="Status of the order")
-    products: List[Any] = Field(default=[], description="Products in the order")
+    products: List[Any] = Field(default_factory=list, description="Products in the order")
 
     id_str: ClassVar[Dict[str, str]] = {
         "delivery": "store_id",
@@ -410,10 +467,11 @@ class Order(BaseModel):
         "train": "train_id"
     }
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def _default_update_time(self):
         if not self.update_time and self.create_time:
             self.update_time = self.create_time
+        return self
 
     def __str__(self) -> str:
         return (f"Order(order_id:{self.order_id}, "
@@ -433,7 +491,7 @@ class Order(BaseModel):
                     f"user_id:{self.user_id}, "
                     f"{self.id_str[self.order_type]}:{self.store_id}, "
                     f"dispatch_time:{self.dispatch_time}, "
-                    f"shipping_time:{self.shipping_time}, " 
+                    f"shipping_time:{self.shipping_time}, "
                     f"delivery_time:{self.delivery_time}, "
                     f"total_price:{self.total_price}, "
                     f"create_time:{self.create_time}, "
@@ -486,6 +544,8 @@ class ExpectedState(BaseModel):
 
 
 class Weather(BaseModel):
+    model_config = _FROZEN_CONFIG
+
     city: str = Field(description="City name")
     category: str = Field(description="Weather category")
     datetime: str = Field(description="Datetime")
@@ -497,4 +557,41 @@ class Weather(BaseModel):
                 f"weather: {self.category}, "
                 f"datetime: {self.datetime}, "
                 f"temperature: {self.temperature[0]}~{self.temperature[1]}, "
-                f"humidity: {self.humidity}")
\ No newline at end of file
+                f"humidity: {self.humidity}")
+
+
+_task_list_adapter = TypeAdapter(list[Task])
+
+
+def load_tasks_file(path: Union[str, Path]) -> list[Task]:
+    """
+    Load a task file into Tasks.
+
+    The parsed tasks are cached per file version (path, mtime and size), so
+    reloading the same file, e.g. for a rerun, skips parsing and validation.
+    Tasks are never modified after loading; each call gets a fresh list.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    return list(_load_tasks_cached(path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=8)
+def _load_tasks_cached(path: str, mtime_ns: int, size: int) -> Tuple[Task, ...]:
+    """
+    Task files are large and mostly free-form dicts (environments, rubrics),
+    which orjson parses about twice as fast as pydantic-core's own JSON
+    parser, so with orjson installed the parsed objects are validated instead
+    of the raw bytes.
+    """
+    with open(path, "rb") as fp:
+        data = fp.read()
+    if orjson is not None:
+        try:
+            tasks = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or integers beyond 64 bits, which pydantic-core accepts.
+            pass
+        else:
+            return tuple(_task_list_adapter.validate_python(tasks))
+    return tuple(_task_list_adapter.validate_json(data))
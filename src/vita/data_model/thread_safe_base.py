@@ -1,185 +1,165 @@
+import itertools
 import threading
-from typing import Dict, TypeVar, Generic, Type
+import warnings
+from typing import Callable, ClassVar, Dict, MutableMapping, TypeVar, Generic, Type
 from abc import ABC, abstractmethod
 
 T = TypeVar('T')
 
+# Registry versions are drawn from one process-wide counter, so a version
+# identifies a single registry state even across threads.
+_versions = itertools.count(1)
+
+
+class _ThreadRegistry(threading.local):
+    """Per-thread instance dictionary; __init__ runs once in each thread."""
+
+    def __init__(self, factory: Callable[[], MutableMapping]):
+        self.instances = factory()
+        self.version = next(_versions)
+
 
 class ThreadSafeBase(ABC, Generic[T]):
     """
     Thread-safe base class providing thread isolation capabilities
-    
-    This base class uses thread ID as the key to store instances for each thread,
-    ensuring complete data isolation between different threads.
-    
+
+    Each direct subclass gets a thread-local registry holding the instance
+    dictionary, shared with its own subclasses, so every thread sees only
+    the instances it registered and no locking is needed.
+
     Supports polymorphic design: parent classes can access instances of all subclasses.
     """
-    
-    def __init__(self):
-        self._instances: Dict[int, Dict[str, T]] = {}
-        self._lock = threading.Lock()
-    
+
+    _tls: _ThreadRegistry
+    # Mapping type for the registry. A root can use weakref.WeakValueDictionary
+    # so that instances are dropped as soon as nothing else references them.
+    _registry_factory: ClassVar[Callable[[], MutableMapping]] = dict
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Only the root of each hierarchy (e.g. StoreBaseModel) owns storage;
+        # Store, Hotel, ... inherit it so the base sees their instances.
+        if ThreadSafeBase in cls.__bases__:
+            cls._tls = _ThreadRegistry(cls._registry_factory)
+
     @classmethod
     def _get_thread_instances(cls) -> Dict[str, T]:
         """
         Get all instances for the current thread
-        
+
         Returns:
             Dict[str, T]: Dictionary of instances for the current thread
         """
-        thread_id = threading.get_ident()
-        
-        if not hasattr(cls, '_global_instances'):
-            cls._global_instances = {}
-            cls._global_lock = threading.Lock()
-        
-        with cls._global_lock:
-            if thread_id not in cls._global_instances:
-                cls._global_instances[thread_id] = {}
-            return cls._global_instances[thread_id]
-    
+        return cls._tls.instances
+
     @classmethod
     def _get_polymorphic_instances(cls) -> Dict[str, T]:
         """
         Get all polymorphic instances for the current thread (including subclass instances)
-        
+
+        Subclasses register into the registry of their hierarchy root, so this
+        is the same dictionary as the root's plain instances.
+
         Returns:
             Dict[str, T]: All polymorphic instances for the current thread
         """
-        thread_id = threading.get_ident()
-        
-        if not hasattr(cls, '_polymorphic_instances'):
-            cls._polymorphic_instances = {}
-            cls._polymorphic_lock = threading.Lock()
-        
-        with cls._polymorphic_lock:
-            if thread_id not in cls._polymorphic_instances:
-                cls._polymorphic_instances[thread_id] = {}
-            return cls._polymorphic_instances[thread_id]
-    
+        return cls._tls.instances
+
     @classmethod
     def clear_thread_data(cls):
         """
         Clear data for the current thread, used when starting a thread
-        
+
         This method should be called at the beginning of each thread to ensure thread data isolation.
         """
-        thread_id = threading.get_ident()
-        
-        if not hasattr(cls, '_global_instances'):
-            cls._global_instances = {}
-            cls._global_lock = threading.Lock()
-        
-        if not hasattr(cls, '_polymorphic_instances'):
-            cls._polymorphic_instances = {}
-            cls._polymorphic_lock = threading.Lock()
-        
-        with cls._global_lock:
-            cls._global_instances[thread_id] = {}
-        
-        with cls._polymorphic_lock:
-            cls._polymorphic_instances[thread_id] = {}
-    
+        cls._tls.instances = cls._registry_factory()
+        cls._tls.version = next(_versions)
+
     @classmethod
     def clear_all(cls):
         """
         Clear all instances for the current thread
         """
-        thread_id = threading.get_ident()
-        
-        if not hasattr(cls, '_global_instances'):
-            cls._global_instances = {}
-            cls._global_lock = threading.Lock()
-        
-        if not hasattr(cls, '_polymorphic_instances'):
-            cls._polymorphic_instances = {}
-            cls._polymorphic_lock = threading.Lock()
-        
-        with cls._global_lock:
-            if thread_id in cls._global_instances:
-                cls._global_instances[thread_id].clear()
-        
-        with cls._polymorphic_lock:
-            if thread_id in cls._polymorphic_instances:
-                cls._polymorphic_instances[thread_id].clear()
-    
+        cls._tls.instances.clear()
+        cls._tls.version = next(_versions)
+
     @classmethod
     def get_all(cls) -> Dict[str, T]:
         """
         Get all instances for the current thread
-        
+
         Returns:
             Dict[str, T]: All instances for the current thread
         """
         return cls._get_thread_instances()
-    
+
     @classmethod
     def get_all_polymorphic(cls) -> Dict[str, T]:
         """
         Get all polymorphic instances for the current thread (including subclass instances)
-        
+
         Returns:
             Dict[str, T]: All polymorphic instances for the current thread
         """
         return cls._get_polymorphic_instances()
-    
+
+    @classmethod
+    def get_registry_version(cls) -> int:
+        """
+        Get a stamp of the current thread's registry contents
+
+        The stamp changes whenever an instance is registered or the registry
+        is cleared, so it can key caches derived from get_all(). Entries that
+        a weak registry drops on its own do not change it.
+
+        Returns:
+            int: Version of the current thread's registry
+        """
+        return cls._tls.version
+
     @classmethod
     def cleanup_thread(cls):
         """
         Clean up data from terminated threads
-        
-        This method can be called periodically to clean up data from threads that have ended.
-        """
-        if not hasattr(cls, '_global_instances'):
-            return
-        
-        current_threads = {thread.ident for thread in threading.enumerate()}
-        
-        with cls._global_lock:
-            dead_threads = [tid for tid in cls._global_instances.keys() if tid not in current_threads]
-            for tid in dead_threads:
-                del cls._global_instances[tid]
-        
-        if hasattr(cls, '_polymorphic_instances'):
-            with cls._polymorphic_lock:
-                dead_threads = [tid for tid in cls._polymorphic_instances.keys() if tid not in current_threads]
-                for tid in dead_threads:
-                    del cls._polymorphic_instances[tid]
-    
+
+        Deprecated: thread-local data is released automatically when its
+        thread ends, so there is nothing left to clean up.
+        """
+        warnings.warn(
+            "ThreadSafeBase.cleanup_thread() is deprecated and does nothing: "
+            "per-thread registries are released when their thread ends.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
     @abstractmethod
     def get_instance_key(self) -> str:
         """
         Get the unique key for the instance
-        
+
         Returns:
             str: The unique key for the instance
         """
         pass
-    
+
     def register_instance(self):
         """
         Register the current instance to thread storage
         """
-        instances = self._get_thread_instances()
-        instances[self.get_instance_key()] = self
-    
+        tls = self._tls
+        tls.instances[self.get_instance_key()] = self
+        tls.version = next(_versions)
+
     def register_polymorphic_instance(self, base_class: Type[T]):
         """
         Register the current instance to polymorphic storage
-        
+
+        register_instance already makes the instance visible to its base
+        classes; this is only needed to re-register under base_class.
+
         Args:
             base_class: Base class type for polymorphic storage
         """
-        if not hasattr(base_class, '_polymorphic_instances'):
-            base_class._polymorphic_instances = {}
-            base_class._polymorphic_lock = threading.Lock()
-        
-        thread_id = threading.get_ident()
-        
-        with base_class._polymorphic_lock:
-            if thread_id not in base_class._polymorphic_instances:
-                base_class._polymorphic_instances[thread_id] = {}
-            base_class._polymorphic_instances[thread_id][self.get_instance_key()] = self
-
-
- 
\ No newline at end of file
+        tls = base_class._tls
+        tls.instances[self.get_instance_key()] = self
+        tls.version = next(_versions)
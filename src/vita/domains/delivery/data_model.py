@@ -1,21 +1,32 @@
-from typing import List, Union, Any, Dict
+from functools import cached_property
+from typing import List, Any, Dict, Optional, Tuple
 
-from pydantic import Field, field_validator
+from pydantic import BeforeValidator, Field, PrivateAttr
+from typing_extensions import Annotated
 
 from vita.data_model.tasks import ProductBaseModel, StoreBaseModel, Location
 from vita.environment.db import DB
 
 
+def _join_if_list(attributes: Any) -> Any:
+    if isinstance(attributes, list):
+        return ", ".join(attributes)
+    return attributes
+
+
 class StoreProduct(ProductBaseModel):
     """Represents a product with its variants"""
 
     name: str = Field(description="Name of the product")
     store_id: str = Field(description="ID of the store this product belongs to")
     store_name: str = Field(description="Name of the store")
-    attributes: Union[str, List] = Field(description="Attributes of the product")
+    attributes: Annotated[str, BeforeValidator(_join_if_list)] = Field(description="Attributes of the product")
     tags: List[str] = Field(description="Tags of the product")
 
-    def __repr__(self):
+    # Products are never modified in place (DB updates re-validate a new
+    # instance), so the search tools can reuse the rendered text.
+    @cached_property
+    def _repr(self) -> str:
         return (f"StoreProduct(store_name={self.store_name}, "
                 f"store_id={self.store_id}, "
                 f"product_name={self.name}, "
@@ -25,13 +36,15 @@ class StoreProduct(ProductBaseModel):
                 f"price={self.price}, "
                 f"tags={self.tags})")
 
-    @field_validator("attributes")
-    @classmethod
-    def validate_attributes(cls, attributes: Any):
-        if isinstance(attributes, list):
-            return ", ".join(attributes)
-        else:
-            return attributes
+    def __repr__(self):
+        return self._repr
+
+    def __copy__(self):
+        # model_copy(update=...) starts from __copy__; drop the rendered text
+        # so the copy is rendered from its own fields.
+        copied = super().__copy__()
+        copied.__dict__.pop("_repr", None)
+        return copied
 
 
 class Store(StoreBaseModel):
@@ -45,22 +58,36 @@ class Store(StoreBaseModel):
         description="List of products"
     )
 
-    def __repr__(self):
-        products_repr = "\n".join(repr(p) for p in self.products)
+    # Like StoreProduct, stores are never modified in place.
+    @cached_property
+    def _repr(self) -> str:
+        products_repr = "\n".join(map(repr, self.products)) if self.products else ""
         return (f"Store(name={self.name}, "
                 f"store_id={self.store_id}, "
                 f"score={self.score}, "
-                f"location={repr(self.location)}, "
+                f"location={self.location!r}, "
                 f"tags={self.tags}), "
                 f"products={products_repr}")
 
-    def __str__(self):
+    @cached_property
+    def _search_text(self) -> str:
+        """Name and tags as matched by delivery_store_search_recommend."""
+        return self.name + ','.join(self.tags)
+
+    @cached_property
+    def _str(self) -> str:
         return (f"Store(name={self.name}, "
                 f"store_id={self.store_id}, "
                 f"score={self.score}, "
-                f"location={repr(self.location)}, "
+                f"location={self.location!r}, "
                 f"tags={self.tags})")
 
+    def __repr__(self):
+        return self._repr
+
+    def __str__(self):
+        return self._str
+
 
 class DeliveryDB(DB):
     """Database containing all delivery-related data including stores"""
@@ -69,6 +96,60 @@ class DeliveryDB(DB):
         description="Dictionary of all products indexed by product ID"
     )
 
+    # (stores mapping it was built from, {store_id: search text})
+    _store_tags: Optional[Tuple[Dict[str, Store], Dict[str, str]]] = PrivateAttr(default=None)
+    # (stores mapping it was built from, {product_id: search text})
+    _product_tags: Optional[Tuple[Dict[str, Store], Dict[str, str]]] = PrivateAttr(default=None)
+    # (stores mapping it was built from, {product_id: product})
+    _store_products: Optional[Tuple[Dict[str, Store], Dict[str, StoreProduct]]] = PrivateAttr(default=None)
+
+    def get_store_tags(self) -> Dict[str, str]:
+        """Get {store_id: store name + tags} used for store keyword search.
+
+        No delivery tool writes to a Store, so the text is fixed task data.
+        """
+        return self._table_index(
+            "_store_tags",
+            self.stores,
+            lambda: {store.store_id: store._search_text for store in self.stores.values()},
+        )
+
+    def get_product_tags(self) -> Dict[str, str]:
+        """Get {product_id: store name + product name + tags} used for product
+        keyword search.
+
+        Ordering a product registers a copy under the same product_id whose
+        store, name and tags are unchanged, so the text stays valid for the
+        lifetime of the stores mapping.
+        """
+        return self._table_index(
+            "_product_tags",
+            self.stores,
+            lambda: {
+                product.product_id: f"{product.store_name} {product.name} {product.tags}"
+                for store in self.stores.values()
+                for product in store.products
+            },
+        )
+
+    def get_store_products(self) -> Dict[str, StoreProduct]:
+        """Get {product_id: catalog product} for the products of this DB's stores.
+
+        The product registry holds products weakly and an ordered copy takes
+        over its product_id there; if the order is then rejected, the copy is
+        collected and the id drops out of the registry. The catalog entry
+        here stays.
+        """
+        return self._table_index(
+            "_store_products",
+            self.stores,
+            lambda: {
+                product.product_id: product
+                for store in self.stores.values()
+                for product in store.products
+            },
+        )
+
     def get_statistics(self) -> dict[str, Any]:
         """Get the statistics of the database."""
         num_stores = len(self.stores)
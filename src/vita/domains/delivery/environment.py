@@ -1,12 +1,19 @@
-import json
 from typing import Optional
 
-from vita.data_model.tasks import Task
+from vita.data_model.tasks import Task, load_tasks_file
 from vita.domains.delivery.data_model import DeliveryDB
 from vita.domains.delivery.tools import DeliveryTools
 from vita.utils.utils import get_task_file_path
 from vita.environment.environment import Environment
 
+# Task environment keys that belong to the DeliveryDB, and the tables it needs
+# even when a task leaves them out.
+_DB_KEYS = frozenset((
+    "stores", "orders", "time", "user_id", "weather", "location",
+    "user_historical_behaviors",
+))
+_DB_TABLES = ("stores", "orders")
+
 
 def get_environment(
         db: Optional[DeliveryDB] = None,
@@ -20,14 +27,13 @@ def get_environment(
     if db is None:
         db = {}
 
-    db_dict = {k: v for k, v in db.items() if
-               k in ["stores", "orders", "time", "user_id", "weather", "location", "user_historical_behaviors"]}
-    if "stores" not in db_dict:
-        db_dict["stores"] = {}
-    if "orders" not in db_dict:
-        db_dict["orders"] = {}
+    # A DB instance has already been validated; only raw task data needs it.
+    if not isinstance(db, DeliveryDB):
+        db_dict = {k: v for k, v in db.items() if k in _DB_KEYS}
+        for table in _DB_TABLES:
+            db_dict.setdefault(table, {})
 
-    db = DeliveryDB.model_validate(db_dict)
+        db = DeliveryDB.model_validate(db_dict)
     tools = DeliveryTools(db)
     from vita.environment.environment import get_agent_policy
     return Environment(
@@ -38,7 +44,4 @@ def get_environment(
 
 
 def get_tasks(language: str = None) -> list[Task]:
-    task_path = get_task_file_path("delivery", language)
-    with open(task_path, "r", encoding="utf-8") as fp:
-        tasks = json.load(fp)
-    return [Task.model_validate(task) for task in tasks]
+    return load_tasks_file(get_task_file_path("delivery", language))
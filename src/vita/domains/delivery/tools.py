@@ -13,6 +13,12 @@ from vita.environment.toolkit import ToolKitBase, ToolType, is_tool
 from vita.utils.utils import check_time_format, get_now, str_to_datetime, format_time, rerank
 
 
+def _distance_to_time(distance: float) -> float:
+    """Delivery minutes for a distance in meters; create_delivery_order calls
+    this directly instead of going through the tool wrapper."""
+    return round(25.00 + int(distance) * 0.006510, 0)
+
+
 class DeliveryTools(ToolKitBase):
     """All the tools for the delivery domain."""
 
@@ -37,24 +43,14 @@ class DeliveryTools(ToolKitBase):
         Returns:
             dict: {store_id: store_name + ',' + tags, ...}
         """
-        tag_dict = {}
-        for store in self.db.stores.values():
-            tag_dict[store.store_id] = store.name + ','.join(store.tags)
-        return tag_dict
+        return self.db.get_store_tags()
 
     def _get_store_product_tags(self) -> Dict[str, str]:
         """Get the product tags from the database.
         Returns:
             dict: {store_id_product_id: store_name + ',' + product_name + ',' + tags, ...}
         """
-        product_tags_dict = {}
-
-        product_dict = StoreProduct.get_all_products()
-        for product in product_dict.values():
-            if isinstance(product, StoreProduct):
-                product_tags_dict[product.product_id] = f"{product.store_name} {product.name} {product.tags}"
-
-        return product_tags_dict
+        return self.db.get_product_tags()
 
     def _get_delivery_order(self, order_id: Optional[str] = None) -> Union[Order, List[Order]]:
         """Get the order from the database.
@@ -110,9 +106,10 @@ class DeliveryTools(ToolKitBase):
         Returns:
             Store: The store.
         """
-        if store_id not in self.db.stores.keys():
+        store = self.db.stores.get(store_id)
+        if store is None:
             raise ValueError(f"Store {store_id} not found")
-        return self.db.stores[store_id]
+        return store
 
     def _get_store_product(self, product_id: str) -> StoreProduct:
         """Get the product from the database.
@@ -123,10 +120,11 @@ class DeliveryTools(ToolKitBase):
         Returns:
             StoreProduct: The product.
         """
-        product_dict = StoreProduct.get_all_products()
-        if product_id not in product_dict:
-            raise ValueError(f"{product_id} not found")
-        product = product_dict[product_id]
+        product = StoreProduct.get_all_products().get(product_id)
+        if product is None:
+            product = self.db.get_store_products().get(product_id)
+            if product is None:
+                raise ValueError(f"{product_id} not found")
 
         if not isinstance(product, StoreProduct):
             raise ValueError(f"{product_id} is not a delivery product")
@@ -136,7 +134,7 @@ class DeliveryTools(ToolKitBase):
     def delivery_distance_to_time(self, distance: float) -> float:
         assert isinstance(distance, float) or isinstance(distance,
                                                          int), f"distance value type should be float or int, but get {type(distance)}"
-        return round(25.00 + int(distance) * 0.006510, 0)
+        return _distance_to_time(distance)
 
     @is_tool(ToolType.READ)
     def get_delivery_store_info(self, store_id: str) -> str:
@@ -170,8 +168,8 @@ class DeliveryTools(ToolKitBase):
         try:
             keywords_str = "".join(keywords)
             assert keywords_str and keywords_str.strip(), "Keywords cannot be empty"
-            id_candidates_sorted = rerank(keywords_str, store_tag_dict)
-            selected_ids = [ic[0] for ic in id_candidates_sorted[:top_k]]
+            id_candidates_sorted = rerank(keywords_str, store_tag_dict, top_k=top_k)
+            selected_ids = [ic[0] for ic in id_candidates_sorted]
             if not selected_ids:
                 return "No stores found matching the keywords"
             
@@ -204,8 +202,8 @@ class DeliveryTools(ToolKitBase):
         try:
             keywords_str = "".join(keywords)
             assert keywords_str and keywords_str.strip(), "Keywords cannot be empty"
-            id_candidates_sorted = rerank(keywords_str, product_tag_dict)
-            selected_ids = [ic[0] for ic in id_candidates_sorted[:top_k]]
+            id_candidates_sorted = rerank(keywords_str, product_tag_dict, top_k=top_k)
+            selected_ids = [ic[0] for ic in id_candidates_sorted]
             if not selected_ids:
                 return "No products found matching the keywords"
             
@@ -240,28 +238,30 @@ class DeliveryTools(ToolKitBase):
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
         assert store_id in self.db.stores, f"Store {store_id} not found"
-        assert all([self._get_store_product(product_id) is not None for product_id in product_ids]), f"products {product_ids} not found"
+        # Raises ValueError naming the first unknown product id.
+        products = [self._get_store_product(product_id) for product_id in product_ids]
         assert address != "", f"Location {address} is empty"
         assert len(product_ids) == len(product_cnts) and all(
-            [cnt > 0 for cnt in product_cnts]), f"product_cnts {product_cnts} list is invalid"
+            cnt > 0 for cnt in product_cnts), f"product_cnts {product_cnts} list is invalid"
         assert dispatch_time and check_time_format(
             dispatch_time), f"dispatch_time {dispatch_time} time format is invalid, yyyy-mm-dd HH:MM:SS required"
-        assert str_to_datetime(dispatch_time) >= str_to_datetime(
-            self.get_now("%Y-%m-%d %H:%M:%S")), f"dispatch_time {dispatch_time} must be in the future"
+        now = self.get_now("%Y-%m-%d %H:%M:%S")
+        dispatch_datetime = str_to_datetime(dispatch_time)
+        assert dispatch_datetime >= str_to_datetime(
+            now), f"dispatch_time {dispatch_time} must be in the future"
         # assert create_time and check_time_format(
         #     create_time), f"create_time {create_time} time format is invalid, yyyy-mm-dd HH:MM:SS required"
         # assert str_to_datetime(create_time) >= str_to_datetime(
         #     self.get_now("%Y-%m-%d %H:%M:%S")), f"create_time {create_time} must be in the future"
-        products = [self._get_store_product(product_id) for product_id in product_ids]
 
         store = self._get_store(store_id)
         longitude, latitude = self.address_to_longitude_latitude(address)
         distance = self.longitude_latitude_to_distance(longitude, latitude, store.location.longitude,
                                                        store.location.latitude)
-        shipping_time = self.delivery_distance_to_time(distance)
-        delivery_time = format_time(str_to_datetime(dispatch_time) + timedelta(minutes=shipping_time),
+        shipping_time = _distance_to_time(distance)
+        delivery_time = format_time(dispatch_datetime + timedelta(minutes=shipping_time),
                                     "%Y-%m-%d %H:%M:%S")
-        total_amount = sum([product.price * cnt for product, cnt in zip(products, product_cnts)])
+        total_amount = sum(product.price * cnt for product, cnt in zip(products, product_cnts))
         attribute_list = [""] * len(products)
         attributes = attributes if attributes is not None else []
         for i, attr in enumerate(attributes[:len(products)]):
@@ -269,16 +269,27 @@ class DeliveryTools(ToolKitBase):
                 attribute_list[i] = attr
         ordered_products = []
         for product, cnt, attr in zip(products, product_cnts, attribute_list):
-            store_product = StoreProduct(
-                product_id=product.product_id,
-                name=product.name,
-                store_id=product.store_id,
-                store_name=product.store_name,
-                price=product.price,
-                quantity=cnt,
-                attributes=attr,
-                tags=product.tags
-            )
+            if type(cnt) is int and type(attr) is str:
+                # Only quantity and attributes differ from the catalog product,
+                # and both are already what validation would produce, so copy
+                # it instead of re-validating every field. model_copy skips
+                # validation, so register the copy as the constructor would.
+                store_product = product.model_copy(
+                    update={"quantity": cnt, "attributes": attr, "tags": list(product.tags)}
+                )
+                store_product.register_instance()
+            else:
+                # e.g. a list of attributes, which the validator joins.
+                store_product = StoreProduct(
+                    product_id=product.product_id,
+                    name=product.name,
+                    store_id=product.store_id,
+                    store_name=product.store_name,
+                    price=product.price,
+                    quantity=cnt,
+                    attributes=attr,
+                    tags=product.tags
+                )
             ordered_products.append(store_product)
 
         order = Order(
@@ -295,8 +306,8 @@ class DeliveryTools(ToolKitBase):
             shipping_time=shipping_time,
             delivery_time=delivery_time,
             total_price=total_amount,
-            create_time=self.get_now("%Y-%m-%d %H:%M:%S"),
-            update_time=self.get_now("%Y-%m-%d %H:%M:%S"),
+            create_time=now,
+            update_time=now,
             note=note,
             products=ordered_products,
             status="unpaid"
@@ -376,10 +387,10 @@ class DeliveryTools(ToolKitBase):
     def search_delivery_orders(self, user_id: str, status: Optional[OrderStatus] = "unpaid") -> str:
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
-        delivery_orders = []
-        for order in self._get_delivery_order():
-            if order.order_type == "delivery" and order.status == status and order.user_id == user_id:
-                delivery_orders.append(order)
+        delivery_orders = [
+            order for order in self.db.orders.values()
+            if order.order_type == "delivery" and order.status == status and order.user_id == user_id
+        ]
 
         if not delivery_orders:
             return "No delivery orders available"
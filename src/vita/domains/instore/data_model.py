@@ -1,17 +1,42 @@
-from typing import List, Literal, Dict, Any
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import List, Literal, Dict, Any, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
 
 from vita.data_model.tasks import ProductBaseModel, StoreBaseModel, Location
 from vita.environment.db import DB
 
 
-class ShopProduct(ProductBaseModel):
+class _CachedRepr:
+    """Mixin for models that keep their rendered text in a `_repr` cached_property.
+
+    Unlike delivery products, instore products, bookings and reservations are
+    updated in place by the tools (quantity, status, times), so the cached
+    text is dropped whenever a field is assigned or the model is copied.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self.__dict__.pop("_repr", None)
+        super().__setattr__(name, value)
+
+    def __copy__(self):
+        copied = super().__copy__()
+        copied.__dict__.pop("_repr", None)
+        return copied
+
+    def __deepcopy__(self, memo=None):
+        copied = super().__deepcopy__(memo)
+        copied.__dict__.pop("_repr", None)
+        return copied
+
+
+class ShopProduct(_CachedRepr, ProductBaseModel):
     """Represents a product with its variants"""
     name: str = Field(description="Name of the product")
     shop_id: str = Field(description="ID of the shop this product belongs to")
     tags: List[str] = Field(description="Tags of the product")
 
-    def __repr__(self):
+    @cached_property
+    def _repr(self) -> str:
         return (f"ShopProduct(shop_id={self.shop_id}, "
                 f"product_id={self.product_id}, "
                 f"name={self.name}, "
@@ -19,6 +44,9 @@ class ShopProduct(ProductBaseModel):
                 f"quantity={self.quantity}, "
                 f"tags={self.tags})")
 
+    def __repr__(self):
+        return self._repr
+
 
 class Shop(StoreBaseModel):
     """Represents a shop with its variants"""
@@ -53,17 +81,21 @@ class Shop(StoreBaseModel):
                 f"enable_book={self.enable_book}, "
                 f"book_price={self.book_price}, "
                 f"enable_reservation={self.enable_reservation})")
+
+    @cached_property
+    def _product_ids(self) -> frozenset:
+        """IDs of the products on the menu; the tools never change a shop's product list."""
+        return frozenset(product.product_id for product in self.products)
     
     def model_post_init(self, __context) -> None:
         """Set store_id after model initialization and register all products"""
         self.store_id = self.shop_id
-        
-        # Ensure all products are registered to global storage
+
+        # Products validated from data have registered themselves already;
+        # ShopProduct instances passed in as-is are not revalidated, so make
+        # sure every product of the shop is in the current thread's registry.
         for product in self.products:
-            if not hasattr(product, '_registered') or not product._registered:
-                product.register_instance()
-                product.register_polymorphic_instance(ProductBaseModel)
-                product._registered = True
+            product.register_instance()
 
 InstoreOrderStatus = Literal[
     "unpaid",
@@ -74,7 +106,7 @@ InstoreOrderStatus = Literal[
 ]
 
 
-class BookInfo(BaseModel):
+class BookInfo(_CachedRepr, BaseModel):
     book_id: str = Field(description="Booking ID")
     shop_id: str = Field(description="Shop ID")
     book_time: str = Field(description="Booking time in format %Y-%m-%d %H:%M:%S")
@@ -84,7 +116,8 @@ class BookInfo(BaseModel):
     book_price: float = Field(description="Booking price")
     status: InstoreOrderStatus = Field(description="Booking status")
 
-    def __repr__(self):
+    @cached_property
+    def _repr(self) -> str:
         return f"BookInfo(book_id={self.book_id}," \
                f"shop_id={self.shop_id}, " \
                f"book_time={self.book_time}, " \
@@ -93,8 +126,11 @@ class BookInfo(BaseModel):
                f"book_price={self.book_price}, " \
                f"status={self.status}"
 
+    def __repr__(self):
+        return self._repr
+
 
-class ReservationInfo(BaseModel):
+class ReservationInfo(_CachedRepr, BaseModel):
     reservation_id: str = Field(description="Reservation ID")
     shop_id: str = Field(description="Shop ID")
     reservation_time: str = Field(description="Reservation time in format %Y-%m-%d %H:%M:%S")
@@ -103,7 +139,8 @@ class ReservationInfo(BaseModel):
     customer_count: int = Field(description="Number of customers")
     status: InstoreOrderStatus = Field(description="Reservation status")
 
-    def __repr__(self):
+    @cached_property
+    def _repr(self) -> str:
         return f"ReservationInfo(reservation_id={self.reservation_id}," \
                f"shop_id={self.shop_id}, " \
                f"reservation_time={self.reservation_time}, " \
@@ -111,13 +148,69 @@ class ReservationInfo(BaseModel):
                f"customer_count={self.customer_count}, " \
                f"status={self.status}"
 
+    def __repr__(self):
+        return self._repr
+
 
 class InStoreDB(DB):
     """Database containing all instore-related data including shops"""
 
     shops: Dict[str, Shop] = Field(description="Shop information table")
-    books: Dict[str, BookInfo] = Field(default={}, description="Booking information table")
-    reservations: Dict[str, ReservationInfo] = Field(default={}, description="Reservation information table")
+    books: Dict[str, BookInfo] = Field(default_factory=dict, description="Booking information table")
+    reservations: Dict[str, ReservationInfo] = Field(default_factory=dict, description="Reservation information table")
+
+    _shop_tags: Optional[Tuple[Dict[str, Shop], Dict[str, str]]] = PrivateAttr(default=None)
+    _shop_product_tags: Optional[Tuple[Dict[str, Shop], Dict[str, str]]] = PrivateAttr(default=None)
+    _shop_products: Optional[Tuple[Dict[str, Shop], Dict[str, ShopProduct]]] = PrivateAttr(default=None)
+
+    def get_shop_tags(self) -> Dict[str, str]:
+        """Get {shop_id: shop name + tags} used for shop keyword search.
+
+        Bookings and reservations go to their own tables and ordering only
+        changes product stock, so shop names and tags never change.
+        """
+        return self._table_index(
+            "_shop_tags",
+            self.shops,
+            lambda: {
+                shop.shop_id: shop.shop_name + ',' + ','.join(shop.tags)
+                for shop in self.shops.values()
+            },
+        )
+
+    def get_shop_product_tags(self) -> Dict[str, str]:
+        """Get {product_id: product name + tags} used for product keyword search.
+
+        Named apart from DeliveryDB.get_product_tags so that a cross-domain
+        MergedDB does not resolve one to the other.
+        """
+        return self._table_index(
+            "_shop_product_tags",
+            self.shops,
+            lambda: {
+                product.product_id: product.name + "," + ",".join(product.tags)
+                for shop in self.shops.values()
+                for product in shop.products
+            },
+        )
+
+    def get_shop_products(self) -> Dict[str, ShopProduct]:
+        """Get {product_id: product} for the products of this DB's shops.
+
+        Same objects as the product registry holds (the tools update them in
+        place), but scoped to the instore domain so lookups need no type
+        filtering. A product_id listed by two shops maps to the later one, as
+        in the registry.
+        """
+        return self._table_index(
+            "_shop_products",
+            self.shops,
+            lambda: {
+                product.product_id: product
+                for shop in self.shops.values()
+                for product in shop.products
+            },
+        )
 
     def get_statistics(self) -> dict[str, Any]:
         """Get the statistics of the database."""
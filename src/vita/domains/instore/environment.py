@@ -1,12 +1,19 @@
-import json
 from typing import Optional
 
-from vita.data_model.tasks import Task
+from vita.data_model.tasks import Task, load_tasks_file
 from vita.domains.instore.data_model import InStoreDB
 from vita.domains.instore.tools import InStoreTools
 from vita.utils.utils import get_task_file_path
 from vita.environment.environment import Environment
 
+# Task environment keys that belong to the InStoreDB, and the tables it needs
+# even when a task leaves them out.
+_DB_KEYS = frozenset((
+    "shops", "orders", "reservations", "books", "time", "user_id", "weather",
+    "location", "user_historical_behaviors",
+))
+_DB_TABLES = ("shops", "books", "reservations", "orders")
+
 
 def get_environment(
         db: Optional[InStoreDB] = None,
@@ -20,19 +27,13 @@ def get_environment(
     if db is None:
         db = {}
 
-    db_dict = {k: v for k, v in db.items() if
-               k in ["shops", "orders", "reservations", "books", "time", "user_id", "weather", "location",
-                     "user_historical_behaviors"]}
-    if "shops" not in db_dict:
-        db_dict["shops"] = {}
-    if "books" not in db_dict:
-        db_dict["books"] = {}
-    if "reservations" not in db_dict:
-        db_dict["reservations"] = {}
-    if "orders" not in db_dict:
-        db_dict["orders"] = {}
-
-    db = InStoreDB.model_validate(db_dict)
+    # A DB instance has already been validated; only raw task data needs it.
+    if not isinstance(db, InStoreDB):
+        db_dict = {k: v for k, v in db.items() if k in _DB_KEYS}
+        for table in _DB_TABLES:
+            db_dict.setdefault(table, {})
+
+        db = InStoreDB.model_validate(db_dict)
     tools = InStoreTools(db)
     from vita.environment.environment import get_agent_policy
     return Environment(
@@ -43,7 +44,4 @@ def get_environment(
 
 
 def get_tasks(language: str = None) -> list[Task]:
-    task_path = get_task_file_path("instore", language)
-    with open(task_path, "r", encoding="utf-8") as fp:
-        tasks = json.load(fp)
-    return [Task.model_validate(task) for task in tasks]
+    return load_tasks_file(get_task_file_path("instore", language))
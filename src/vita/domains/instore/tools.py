@@ -1,11 +1,14 @@
 """Toolkit for the instore domain."""
 from typing import List, Dict, Optional, Union
 
-from vita.domains.instore.data_model import InStoreDB, ShopProduct, BookInfo, ReservationInfo
-from vita.data_model.tasks import Order
+from vita.domains.instore.data_model import InStoreDB, BookInfo, ReservationInfo
+from vita.data_model.tasks import Order, ProductBaseModel
 from vita.environment.toolkit import ToolKitBase, ToolType, is_tool
 from vita.utils.utils import check_time_format, rerank
 
+# Format of the time arguments and of the update/create times the tools write.
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class InStoreTools(ToolKitBase):
     """All the tools for the instore domain."""
@@ -31,36 +34,29 @@ class InStoreTools(ToolKitBase):
         Returns:
             dict: {shop_id: shop_name + ',' + tags}
         """
-        tag_dict = {}
-        for shop in self.db.shops.values():
-            tag_dict[shop.shop_id] = shop.shop_name + ',' + ','.join(shop.tags)
-        return tag_dict
+        return self.db.get_shop_tags()
 
     def _get_shop_product_tags(self) -> Dict[str, str]:
         """Get the product tags from the database.
         Returns:
             dict: {shop_id_product_id: shop_name shop_tags product_name product_tags}
         """
-        product_tags = {}
-        products = ShopProduct.get_all_products()
-        for id, product in products.items():
-            if isinstance(product, ShopProduct):
-                product_tags[id] = product.name + "," + ",".join(product.tags)
-
-        return product_tags
+        return self.db.get_shop_product_tags()
 
     def _get_shop(self, shop_id: str):
-        if shop_id not in self.db.shops:
+        shop = self.db.shops.get(shop_id)
+        if shop is None:
             raise ValueError(f"Shop {shop_id} does not exist")
-        return self.db.shops[shop_id]
+        return shop
 
     def _get_shop_product(self, product_id: str):
-        product_dict = ShopProduct.get_all_products()
-        if product_id not in product_dict:
+        product = self.db.get_shop_products().get(product_id)
+        if product is None:
+            # In a cross-domain environment the id may belong to another
+            # domain's product; say so rather than that it does not exist.
+            if product_id in ProductBaseModel.get_all_products():
+                raise ValueError(f"Product {product_id} is not an instore scenario product")
             raise ValueError(f"Product {product_id} does not exist")
-        product = product_dict[product_id]
-        if not isinstance(product, ShopProduct):
-            raise ValueError(f"Product {product_id} is not an instore scenario product")
         return product
 
     def _add_book_info(self, book_info: BookInfo) -> str:
@@ -95,9 +91,9 @@ class InStoreTools(ToolKitBase):
         """
         if order_id is None:
             return [order for order in self.db.orders.values() if order.order_type == "instore"]
-        if order_id not in self.db.orders:
+        order = self.db.orders.get(order_id)
+        if order is None:
             raise ValueError(f"Order {order_id} not found")
-        order = self.db.orders[order_id]
         if order.order_type != "instore":
             raise ValueError(f"Order {order_id} is not an instore order")
         return order
@@ -107,18 +103,20 @@ class InStoreTools(ToolKitBase):
         """
         if book_id is None:
             return list(self.db.books.values())
-        if book_id not in self.db.books:
+        book_info = self.db.books.get(book_id)
+        if book_info is None:
             raise ValueError(f"BookInfo {book_id} not found")
-        return self.db.books[book_id]
+        return book_info
     
     def _get_reservation_info(self, reservation_id: Optional[str] = None) -> Union[ReservationInfo, List[ReservationInfo]]:
         """Get the reservation info from the database.
         """
         if reservation_id is None:
             return list(self.db.reservations.values())
-        if reservation_id not in self.db.reservations:
+        reservation_info = self.db.reservations.get(reservation_id)
+        if reservation_info is None:
             raise ValueError(f"ReservationInfo {reservation_id} not found")
-        return self.db.reservations[reservation_id]
+        return reservation_info
     
     def _modify_instore_order(self, order: Order) -> str:
         """Modify order in domain-specific database.
@@ -182,8 +180,8 @@ class InStoreTools(ToolKitBase):
         try:
             keywords_str = "".join(keywords)
             assert keywords_str and keywords_str.strip(), "Keywords cannot be empty"
-            id_candidates_sorted = rerank(keywords_str, shop_tag_dict)
-            selected_ids = [ic[0] for ic in id_candidates_sorted[:top_k]]
+            id_candidates_sorted = rerank(keywords_str, shop_tag_dict, top_k=top_k)
+            selected_ids = [ic[0] for ic in id_candidates_sorted]
             if not selected_ids:
                 return "No shops found matching the keywords"
             
@@ -216,8 +214,8 @@ class InStoreTools(ToolKitBase):
         try:
             keywords_str = "".join(keywords)
             assert keywords_str and keywords_str.strip(), "Keywords cannot be empty"
-            id_candidates_sorted = rerank(keywords_str, product_tag_dict)
-            selected_ids = [ic[0] for ic in id_candidates_sorted[:top_k]]
+            id_candidates_sorted = rerank(keywords_str, product_tag_dict, top_k=top_k)
+            selected_ids = [ic[0] for ic in id_candidates_sorted]
             if not selected_ids:
                 return "No products found matching the keywords"
             
@@ -231,7 +229,7 @@ class InStoreTools(ToolKitBase):
             if not product_list:
                 return "No products found matching the keywords"
             
-            selected_products_repr = "\n".join([repr(product) for product in product_list])
+            selected_products_repr = "\n".join(map(repr, product_list))
             return selected_products_repr
         except Exception as e:
             return f"Error searching products: {e}"
@@ -250,7 +248,7 @@ class InStoreTools(ToolKitBase):
         except ValueError as e:
             return f"Error: {e}"
         
-        if product_id not in [product.product_id for product in shop.products]:
+        if product_id not in shop._product_ids:
             return f"Product {product_id} does not exist in shop {shop_id}"
 
         try:
@@ -259,6 +257,7 @@ class InStoreTools(ToolKitBase):
             return f"Error: {e}"
         
         product.quantity = quantity
+        now = self.get_now(_TIME_FORMAT)
         
         order = Order(
             order_id=self.db.assign_order_id("instore", user_id),
@@ -266,8 +265,8 @@ class InStoreTools(ToolKitBase):
             user_id=user_id,
             store_id=shop_id,
             total_price=quantity * product.price,
-            create_time=self.get_now("%Y-%m-%d %H:%M:%S"),
-            update_time=self.get_now("%Y-%m-%d %H:%M:%S"),
+            create_time=now,
+            update_time=now,
             status="unpaid",
             products=[product],
         )
@@ -290,7 +289,7 @@ class InStoreTools(ToolKitBase):
         
         if order.status == "unpaid":
             order.status = "paid"
-            order.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+            order.update_time = self.get_now(_TIME_FORMAT)
             resp = self._modify_instore_order(order)
             if resp == "done":
                 return "Payment successful"
@@ -312,7 +311,7 @@ class InStoreTools(ToolKitBase):
             return f"Order {order.order_id} is already cancelled."
         
         order.status = "cancelled"
-        order.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+        order.update_time = self.get_now(_TIME_FORMAT)
         resp = self._modify_instore_order(order)
         if resp == "done":
             return f"Order {order.order_id} is cancelled."
@@ -327,7 +326,7 @@ class InStoreTools(ToolKitBase):
         assert time, "Table booking time cannot be empty"
         assert isinstance(customer_count, int), "Customer count must be an integer"
         assert customer_count > 0, "Number of customers for table booking must be greater than 0"
-        assert check_time_format(time, "%Y-%m-%d %H:%M:%S"), "Table booking time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
+        assert check_time_format(time, _TIME_FORMAT), "Table booking time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
 
         try:
             shop = self._get_shop(shop_id)
@@ -348,7 +347,7 @@ class InStoreTools(ToolKitBase):
             book_price=book_price,
             customer_id=user_id,
             status=status,
-            update_time=self.get_now("%Y-%m-%d %H:%M:%S")
+            update_time=self.get_now(_TIME_FORMAT)
         )
         
         response = self._add_book_info(book_info)
@@ -369,7 +368,7 @@ class InStoreTools(ToolKitBase):
         
         if book_info.status == "unpaid":
             book_info.status = "paid"
-            book_info.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+            book_info.update_time = self.get_now(_TIME_FORMAT)
             resp = self._modify_book_info(book_info)
             if resp == "done":
                 return "Payment successful"
@@ -391,7 +390,7 @@ class InStoreTools(ToolKitBase):
             return f"BookInfo {book_info.book_id} is already cancelled."
         
         book_info.status = "cancelled"
-        book_info.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+        book_info.update_time = self.get_now(_TIME_FORMAT)
         resp = self._modify_book_info(book_info)
         if resp == "done":
             return f"BookInfo {book_info.book_id} is cancelled."
@@ -406,7 +405,7 @@ class InStoreTools(ToolKitBase):
         assert time, "Reservation time cannot be empty"
         assert isinstance(customer_count, int), "Customer count must be an integer"
         assert customer_count > 0, "Number of customers for reservation must be greater than 0"
-        assert check_time_format(time, "%Y-%m-%d %H:%M:%S"), "Reservation time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
+        assert check_time_format(time, _TIME_FORMAT), "Reservation time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
 
         try:
             shop = self._get_shop(shop_id)
@@ -420,7 +419,7 @@ class InStoreTools(ToolKitBase):
             customer_id=user_id,
             customer_count=customer_count,
             status="unconsumed",
-            update_time=self.get_now("%Y-%m-%d %H:%M:%S")
+            update_time=self.get_now(_TIME_FORMAT)
         )
         
         response = self._add_reservation_info(reservation)
@@ -436,7 +435,7 @@ class InStoreTools(ToolKitBase):
         assert time, "Reservation time cannot be empty"
         assert isinstance(customer_count, int), "Customer count must be an integer"
         assert customer_count >= 0, "Number of customers for reservation must be greater than or equal to 0"
-        assert check_time_format(time, "%Y-%m-%d %H:%M:%S"), "Reservation time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
+        assert check_time_format(time, _TIME_FORMAT), "Reservation time format is incorrect, correct format is %Y-%m-%d %H:%M:%S"
 
         try:
             reservation_info = self._get_reservation_info(reservation_id)
@@ -448,7 +447,7 @@ class InStoreTools(ToolKitBase):
 
         reservation_info.reservation_time = time
         reservation_info.customer_count = customer_count
-        reservation_info.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+        reservation_info.update_time = self.get_now(_TIME_FORMAT)
         resp = self._modify_reservation_info(reservation_info)
         if resp == "done":
             return repr(reservation_info)
@@ -468,7 +467,7 @@ class InStoreTools(ToolKitBase):
             return f"ReservationInfo {reservation_info.reservation_id} is already cancelled."
         
         reservation_info.status = "cancelled"
-        reservation_info.update_time = self.get_now("%Y-%m-%d %H:%M:%S")
+        reservation_info.update_time = self.get_now(_TIME_FORMAT)
         resp = self._modify_reservation_info(reservation_info)
         if resp == "done":
             return f"ReservationInfo {reservation_info.reservation_id} is cancelled."
@@ -480,47 +479,40 @@ class InStoreTools(ToolKitBase):
     def get_instore_orders(self, user_id: str) -> str:
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
-        instore_orders_all = self._get_instore_order()
-        
-        instore_orders = []
-        for order in instore_orders_all:
-            if order.user_id == user_id:
-                instore_orders.append(order)
+        instore_orders = [
+            order for order in self.db.orders.values()
+            if order.order_type == "instore" and order.user_id == user_id
+        ]
         
         if not instore_orders:
             return f"User {user_id} has no order information."
         
-        orders_repr = "\n".join([repr(order) for order in instore_orders])
+        orders_repr = "\n".join(map(repr, instore_orders))
         return orders_repr
     
     @is_tool(tool_type=ToolType.READ)
     def get_instore_reservations(self, user_id: str) -> str:
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
-        instore_reservations_all = self._get_reservation_info()
-        instore_reservations = []
-        for reservation in instore_reservations_all:
-            if reservation.customer_id == user_id:
-                instore_reservations.append(reservation)
+        instore_reservations = [
+            reservation for reservation in self.db.reservations.values()
+            if reservation.customer_id == user_id
+        ]
         
         if not instore_reservations:
             return f"User {user_id} has no reservation information."
-        reservations_repr = "\n".join([repr(reservation) for reservation in instore_reservations])
+        reservations_repr = "\n".join(map(repr, instore_reservations))
         return reservations_repr
     
     @is_tool(tool_type=ToolType.READ)
     def get_instore_books(self, user_id: str) -> str:
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
-        instore_books_all = self._get_book_info()
-        instore_books = []
-        for book in instore_books_all:
-            if book.customer_id == user_id:
-                instore_books.append(book)
+        instore_books = [book for book in self.db.books.values() if book.customer_id == user_id]
         
         if not instore_books:
             return f"User {user_id} has no book information."
-        books_repr = "\n".join([repr(book) for book in instore_books])
+        books_repr = "\n".join(map(repr, instore_books))
         return books_repr
     
     @is_tool(tool_type=ToolType.READ)
@@ -528,16 +520,12 @@ class InStoreTools(ToolKitBase):
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
         if book_id is None:
-            instore_books_all = self._get_book_info()
-            instore_books = []
-            for book in instore_books_all:
-                if book.customer_id == user_id:
-                    instore_books.append(book)
+            instore_books = [book for book in self.db.books.values() if book.customer_id == user_id]
             
             if not instore_books:
                 return f"User {user_id} has no book information."
             
-            return "\n".join([repr(book) for book in instore_books])
+            return "\n".join(map(repr, instore_books))
         else:
             book = self._get_book_info(book_id)
             if book.customer_id != user_id:
@@ -549,15 +537,15 @@ class InStoreTools(ToolKitBase):
         assert user_id, "User ID cannot be empty"
         assert self._check_user(user_id), "User ID does not match"
         if reservation_id is None:
-            user_reservations = []
-            for reservation in self.db.reservations.values():
-                if reservation.customer_id == user_id:
-                    user_reservations.append(reservation)
+            user_reservations = [
+                reservation for reservation in self.db.reservations.values()
+                if reservation.customer_id == user_id
+            ]
             
             if not user_reservations:
                 return f"User {user_id} has no reservation information."
             
-            return "\n".join([repr(reservation) for reservation in user_reservations])
+            return "\n".join(map(repr, user_reservations))
         else:
             reservation = self._get_reservation_info(reservation_id)
             if reservation.customer_id != user_id:
@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Any, Dict, List, Literal
 from pydantic import Field
 
@@ -73,13 +74,19 @@ class Hotel(StoreBaseModel):
                 f"tags={self.tags}, "
                 f"products={products_repr})")
 
-    def __str__(self):
+    # Store fields are never modified by the tools (only product quantities
+    # are), so the summary shown by the search tools is rendered once.
+    @cached_property
+    def _str(self) -> str:
         return (f"Hotel(hotel_id={self.hotel_id}, "
                 f"hotel_name={self.hotel_name}, "
                 f"score={self.score}, "
                 f"star_rating={self.star_rating}, "
                 f"location={self.location}, "
                 f"tags={self.tags})")
+
+    def __str__(self):
+        return self._str
     
     def model_post_init(self, __context) -> None:
         """Set store_id after model initialization"""
@@ -107,13 +114,17 @@ class Attraction(StoreBaseModel):
                 f"ticket_price={self.ticket_price}, "
                 f"products={products_repr})")
 
-    def __str__(self):
+    @cached_property
+    def _str(self) -> str:
         return (f"Attraction(attraction_id={self.attraction_id}, "
                 f"attraction_name={self.attraction_name}, "
                 f"location={self.location}, "
                 f"description={self.description}, "
                 f"score={self.score}, "
                 f"opening_hours={self.opening_hours}, ")
+
+    def __str__(self):
+        return self._str
     
     def model_post_init(self, __context) -> None:
         """Set store_id after model initialization"""
@@ -145,7 +156,8 @@ class Flight(StoreBaseModel):
                 f"tags={self.tags}, "
                 f"products={products_repr})")
 
-    def __str__(self):
+    @cached_property
+    def _str(self) -> str:
         return (f"Flight(flight_id={self.flight_id}, "
                 f"flight_number={self.flight_number}, "
                 f"departure_city={self.departure_city}, "
@@ -155,6 +167,9 @@ class Flight(StoreBaseModel):
                 f"departure_time={self.departure_time}, "
                 f"arrival_time={self.arrival_time}, "
                 f"tags={self.tags})")
+
+    def __str__(self):
+        return self._str
     
     def model_post_init(self, __context) -> None:
         """Set store_id after model initialization"""
@@ -186,7 +201,8 @@ class Train(StoreBaseModel):
                 f"tags={self.tags}, "
                 f"products={products_repr})")
 
-    def __str__(self):
+    @cached_property
+    def _str(self) -> str:
         return (f"Train(train_id={self.train_id}, "
                 f"train_number={self.train_number}, "
                 f"departure_city={self.departure_city}, "
@@ -196,6 +212,9 @@ class Train(StoreBaseModel):
                 f"departure_time={self.departure_time}, "
                 f"arrival_time={self.arrival_time}, "
                 f"tags={self.tags})")
+
+    def __str__(self):
+        return self._str
     
     def model_post_init(self, __context) -> None:
         """Set store_id after model initialization"""
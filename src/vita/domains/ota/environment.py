@@ -1,12 +1,19 @@
-import json
 from typing import Optional
 
-from vita.data_model.tasks import Task
+from vita.data_model.tasks import Task, load_tasks_file
 from vita.domains.ota.data_model import OTADB
 from vita.domains.ota.tools import OTATools
 from vita.utils.utils import get_task_file_path
 from vita.environment.environment import Environment
 
+# Task environment keys that belong to the OTADB, and the tables it needs
+# even when a task leaves them out.
+_DB_KEYS = frozenset((
+    "orders", "hotels", "attractions", "flights", "trains", "time", "user_id",
+    "weather", "location", "user_historical_behaviors",
+))
+_DB_TABLES = ("hotels", "attractions", "flights", "trains", "orders")
+
 
 def get_environment(
         db: Optional[OTADB] = None,
@@ -20,21 +27,13 @@ def get_environment(
     if db is None:
         db = {}
 
-    db_dict = {k: v for k, v in db.items() if
-               k in ["orders", "hotels", "attractions", "flights", "trains", "time", "user_id", "weather", "location",
-                     "user_historical_behaviors"]}
-    if "hotels" not in db_dict:
-        db_dict["hotels"] = {}
-    if "attractions" not in db_dict:
-        db_dict["attractions"] = {}
-    if "flights" not in db_dict:
-        db_dict["flights"] = {}
-    if "trains" not in db_dict:
-        db_dict["trains"] = {}
-    if "orders" not in db_dict:
-        db_dict["orders"] = {}
-
-    db = OTADB.model_validate(db_dict)
+    # A DB instance has already been validated; only raw task data needs it.
+    if not isinstance(db, OTADB):
+        db_dict = {k: v for k, v in db.items() if k in _DB_KEYS}
+        for table in _DB_TABLES:
+            db_dict.setdefault(table, {})
+
+        db = OTADB.model_validate(db_dict)
     tools = OTATools(db)
     from vita.environment.environment import get_agent_policy
     return Environment(
@@ -45,7 +44,4 @@ def get_environment(
 
 
 def get_tasks(language: str = None) -> list[Task]:
-    task_path = get_task_file_path("ota", language)
-    with open(task_path, "r", encoding="utf-8") as fp:
-        tasks = json.load(fp)
-    return [Task.model_validate(task) for task in tasks]
+    return load_tasks_file(get_task_file_path("ota", language))
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, List
 from datetime import datetime
 from pydantic import Field
 
@@ -19,7 +19,7 @@ class DB(BaseModelNoExtra):
     weather: Optional[List[Weather]] = Field(default=None, description="Weather information")
     location: Optional[List[Location]] = Field(default=None,
                                                description="Address to longitude and latitude information")
-    user_historical_behaviors: Optional[Dict[str, Any]] = Field(default={}, description="User historical behaviors")
+    user_historical_behaviors: Optional[Dict[str, Any]] = Field(default_factory=dict, description="User historical behaviors")
     orders: Optional[Dict[str, Order]] = Field(default=None, description="Orders in the environment")
 
     @classmethod
@@ -46,6 +46,19 @@ class DB(BaseModelNoExtra):
         """Get the statistics of the database."""
         return {}
 
+    def _table_index(self, cache_attr: str, table: dict, build: Callable[[], dict]) -> dict:
+        """Return an index derived from one of this DB's tables.
+
+        The private attribute cache_attr holds (table, index). build() is only
+        called again once the table mapping itself has been replaced, so the
+        index must not depend on anything the tools change in place.
+        """
+        cached = getattr(self, cache_attr)
+        if cached is None or cached[0] is not table:
+            cached = (table, build())
+            setattr(self, cache_attr, cached)
+        return cached[1]
+
     def assign_order_id(self, scenario: str, user_id: str, **kwargs) -> str:
         """Unified order ID assignment function
         
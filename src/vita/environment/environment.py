@@ -15,7 +15,7 @@ from vita.data_model.message import (
     ToolMessage,
     UserMessage,
 )
-from vita.data_model.tasks import EnvAssertion, EnvFunctionCall, Task
+from vita.data_model.tasks import EnvAssertion, EnvFunctionCall, Task, load_tasks_file
 from vita.environment.db import DB, MergedDB
 from vita.environment.tool import Tool
 from vita.environment.toolkit import ToolKitBase, ToolSignature, get_tool_signatures
@@ -353,7 +353,4 @@ def get_cross_environment(
 
 
 def get_cross_tasks(language: str = None) -> list[Task]:
-    task_path = get_task_file_path("cross_domain", language)
-    with open(task_path, "r", encoding="utf-8") as fp:
-        tasks = json.load(fp)
-    return [Task.model_validate(task) for task in tasks]
+    return load_tasks_file(get_task_file_path("cross_domain", language))
@@ -2,8 +2,8 @@ import math
 import logging
 import holidays
 from enum import Enum
-from typing import Annotated, Any, Callable, Dict, Optional, TypeVar
-from functools import wraps
+from typing import Annotated, Any, Callable, Dict, Optional, Tuple, TypeVar
+from functools import lru_cache, wraps
 from datetime import datetime
 from pydantic import BaseModel, Field
 from thefuzz import process, fuzz
@@ -159,6 +159,38 @@ def is_tool(tool_type: ToolType = ToolType.READ, domain: str = None, tool_name:
     return decorator
 
 
+@lru_cache(maxsize=4096)
+def _haversine_distance(longitude1: float, latitude1: float, longitude2: float,
+                        latitude2: float) -> float:
+    if longitude1 == longitude2 and latitude1 == latitude2:
+        return 0.0
+
+    R = 6371000
+    lon1, lat1, lon2, lat2 = map(math.radians, [longitude1, latitude1, longitude2, latitude2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    c = 2 * math.asin(math.sqrt(a))
+    distance = R * c
+    return round(distance, 0)
+
+
+@lru_cache(maxsize=2048)
+def _locate_address(address: str, registry_version: int) -> Optional[Tuple[float, float]]:
+    """Resolve address against the known Locations, or None if nothing matches.
+
+    registry_version is Location.get_registry_version(); it is only part of
+    the cache key, so a lookup is reused until a Location is registered.
+    """
+    address_lng_lat_dict = Location.get_all()
+    address_lng_lat_dict_for_rerank = {address: address for address in address_lng_lat_dict.keys()}
+    address_info = rerank(address, address_lng_lat_dict_for_rerank, True)[0]
+    if address_info[-1] < 30 or not fuzzy_ratio_match(address, address_info[0]):
+        return None
+    address_lng_lat = address_lng_lat_dict.get(address_info[0])
+    return address_lng_lat.longitude, address_lng_lat.latitude
+
+
 class ToolKitBase(metaclass=ToolKitType):
     """Base class for ToolKit classes."""
 
@@ -266,17 +298,7 @@ class ToolKitBase(metaclass=ToolKitType):
     @is_tool(ToolType.GENERIC)
     def longitude_latitude_to_distance(self, longitude1: float, latitude1: float, longitude2: float,
                                        latitude2: float) -> float:
-        if longitude1 == longitude2 and latitude1 == latitude2:
-            return 0.0
-
-        R = 6371000
-        lon1, lat1, lon2, lat2 = map(math.radians, [longitude1, latitude1, longitude2, latitude2])
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        c = 2 * math.asin(math.sqrt(a))
-        distance = R * c
-        return round(distance, 0)
+        return _haversine_distance(longitude1, latitude1, longitude2, latitude2)
 
     @is_tool(ToolType.GENERIC)
     def weather(self, address: str, date_start: str, date_end: str) -> str:
@@ -312,13 +334,10 @@ class ToolKitBase(metaclass=ToolKitType):
     @is_tool(ToolType.GENERIC)
     def address_to_longitude_latitude(self, address: str) -> tuple[float, float]:
         assert address and address.strip(), "Address cannot be empty"
-        address_lng_lat_dict = Location.get_all()
-        address_lng_lat_dict_for_rerank = {address: address for address in address_lng_lat_dict.keys()}
-        address_info = rerank(address, address_lng_lat_dict_for_rerank, True)[0]
-        if address_info[-1] < 30 or not fuzzy_ratio_match(address, address_info[0]):
+        longitude_latitude = _locate_address(address, Location.get_registry_version())
+        if longitude_latitude is None:
             raise ValueError(f"Longitude and latitude not found for address {address}")
-        address_lng_lat = address_lng_lat_dict.get(address_info[0])
-        return [address_lng_lat.longitude, address_lng_lat.latitude]
+        return list(longitude_latitude)
 
     @is_tool(ToolType.GENERIC)
     def get_date_holiday_info(self, date: str) -> str:
@@ -445,59 +464,59 @@ class ToolKitBase(metaclass=ToolKitType):
 
         if hasattr(self.db, "stores"):
             for store in self.db.stores.values():
-                distance = self.longitude_latitude_to_distance(longitude, latitude, store.location.longitude,
-                                                               store.location.latitude)
+                distance = _haversine_distance(longitude, latitude, store.location.longitude,
+                                               store.location.latitude)
                 if distance <= range:
                     target_list.append(str(store))
 
         if hasattr(self.db, "shops"):
             for shop in self.db.shops.values():
-                distance = self.longitude_latitude_to_distance(longitude, latitude, shop.location.longitude,
-                                                               shop.location.latitude)
+                distance = _haversine_distance(longitude, latitude, shop.location.longitude,
+                                               shop.location.latitude)
                 if distance <= range:
                     target_list.append(str(shop))
 
         if hasattr(self.db, "hotels"):
             for hotel in self.db.hotels.values():
-                distance = self.longitude_latitude_to_distance(longitude, latitude, hotel.location.longitude,
-                                                               hotel.location.latitude)
+                distance = _haversine_distance(longitude, latitude, hotel.location.longitude,
+                                               hotel.location.latitude)
                 if distance <= range:
                     target_list.append(str(hotel))
 
         if hasattr(self.db, "attractions"):
             for attraction in self.db.attractions.values():
-                distance = self.longitude_latitude_to_distance(longitude, latitude, attraction.location.longitude,
-                                                               attraction.location.latitude)
+                distance = _haversine_distance(longitude, latitude, attraction.location.longitude,
+                                               attraction.location.latitude)
                 if distance <= range:
                     target_list.append(str(attraction))
 
         if hasattr(self.db, "flights"):
             for flight in self.db.flights.values():
-                dep_distance = self.longitude_latitude_to_distance(longitude, latitude,
-                                                                   flight.departure_airport_location.longitude,
-                                                                   flight.departure_airport_location.latitude)
+                dep_distance = _haversine_distance(longitude, latitude,
+                                                   flight.departure_airport_location.longitude,
+                                                   flight.departure_airport_location.latitude)
                 if dep_distance <= range:
                     target_list.append(str(flight))
                     continue
 
-                arr_distance = self.longitude_latitude_to_distance(longitude, latitude,
-                                                                   flight.arrival_airport_location.longitude,
-                                                                   flight.arrival_airport_location.latitude)
+                arr_distance = _haversine_distance(longitude, latitude,
+                                                   flight.arrival_airport_location.longitude,
+                                                   flight.arrival_airport_location.latitude)
                 if arr_distance <= range:
                     target_list.append(str(flight))
 
         if hasattr(self.db, "trains"):
             for train in self.db.trains.values():
-                dep_distance = self.longitude_latitude_to_distance(longitude, latitude,
-                                                                   train.departure_station_location.longitude,
-                                                                   train.departure_station_location.latitude)
+                dep_distance = _haversine_distance(longitude, latitude,
+                                                   train.departure_station_location.longitude,
+                                                   train.departure_station_location.latitude)
                 if dep_distance <= range:
                     target_list.append(str(train))
                     continue
 
-                arr_distance = self.longitude_latitude_to_distance(longitude, latitude,
-                                                                   train.arrival_station_location.longitude,
-                                                                   train.arrival_station_location.latitude)
+                arr_distance = _haversine_distance(longitude, latitude,
+                                                   train.arrival_station_location.longitude,
+                                                   train.arrival_station_location.latitude)
                 if arr_distance <= range:
                     target_list.append(str(train))
 
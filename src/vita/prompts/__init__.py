@@ -1,7 +1,10 @@
 import os
 import yaml
+from functools import lru_cache
 from vita.config import DEFAULT_LANGUAGE
 
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class Prompts:
     def __init__(self, language: str = DEFAULT_LANGUAGE):
         self.language = language
@@ -13,7 +16,7 @@ class Prompts:
         for prompt_yaml in prompt_yamls:
             prompt_name = prompt_yaml.split('.')[0]
             with open(os.path.join(os.path.dirname(__file__), prompt_yaml), 'r', encoding='utf-8') as f:
-                prompt_data = yaml.load(f, Loader=yaml.FullLoader)
+                prompt_data = yaml.load(f, Loader=_YamlLoader)
                 if self.language not in prompt_data:
                     raise ValueError(f"Language {self.language} not found in prompt {prompt_yaml}")
                 setattr(self, prompt_name, prompt_data[self.language])
@@ -33,9 +36,14 @@ class Prompts:
 # Global prompts instance
 prompts = Prompts()
 
+@lru_cache(maxsize=None)
+def _get_language_prompts(language: str) -> Prompts:
+    """Load prompts for a language once; the YAML files are static at runtime"""
+    return Prompts(language)
+
 def get_prompts(language: str = None) -> Prompts:
     """Get prompts instance with specified language"""
     if language is None:
         return prompts
     else:
-        return Prompts(language)
\ No newline at end of file
+        return _get_language_prompts(language)
\ No newline at end of file
@@ -2,8 +2,9 @@ import copy
 import json
 import re
 import time
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import Any, Optional, List, Dict
+from typing import Any, Optional, List, Dict, Iterable
 
 from loguru import logger
 from openai import OpenAI
@@ -54,6 +55,21 @@ class DictToObject:
         return result
 
 
+@lru_cache(maxsize=None)
+def _get_client(api_key: str, base_url: str, timeout: float) -> OpenAI:
+    """
+    Get a shared OpenAI client for an endpoint.
+    The client is thread-safe and keeps an HTTP connection pool, so reusing it
+    across calls (and across concurrent simulations) avoids a new TCP/TLS
+    handshake per request.
+    """
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+    )
+
+
 def get_response_cost(usage, model) -> float:
     num_prompt_token = usage["prompt_tokens"]
     num_completion_token = usage["completion_tokens"]
@@ -75,7 +91,7 @@ def get_response_usage(response) -> Optional[dict]:
     }
 
 
-def format_messages(messages: list[Message]) -> list[dict]:
+def format_messages(messages: Iterable[Message]) -> list[dict]:
     messages_formatted = []
     for message in messages:
         if isinstance(message, UserMessage):
@@ -156,7 +172,7 @@ def add_anthropic_caching(messages: List[Dict[str, Any]], model_name: str) -> Li
 
 def generate(
     model: str,
-    messages: list[Message],
+    messages: Iterable[Message],
     tools: Optional[list[Tool]] = None,
     tool_choice: Optional[str] = None,
     **kwargs: Any,
@@ -263,11 +279,7 @@ def generate(
         last_err: Exception | None = None
         for attempt in range(max_retries + 1):
             try:
-                client = OpenAI(
-                    api_key=api_key,
-                    base_url=base_url,
-                    timeout=timeout,
-                )
+                client = _get_client(api_key, base_url, timeout)
                 response = client.chat.completions.create(
                     model=model,
                     messages=messages_formatted,
@@ -3,6 +3,7 @@
 This file contains common functions and utilities used in all tool schema definition files.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from vita.config import DEFAULT_LANGUAGE
 
@@ -30,7 +31,9 @@ def register_tool_descriptions(domain: str, descriptions: Dict[str, Dict[str, An
         domain: Domain name (e.g., 'delivery', 'instore', 'ota', 'toolkit')
         descriptions: Mapping dictionary from tool names to descriptions
     """
-    TOOL_DESCRIPTIONS_REGISTRY[domain] = descriptions
+    if TOOL_DESCRIPTIONS_REGISTRY.get(domain) is not descriptions:
+        TOOL_DESCRIPTIONS_REGISTRY[domain] = descriptions
+        _build_tool_docstring.cache_clear()
 
 def get_tool_description(domain: str, tool_name: str) -> Optional[Dict[str, Any]]:
     """Get tool description from registry
@@ -58,16 +61,15 @@ def generate_tool_docstring(domain: str, tool_name: str, language: str = None) -
     """
     if language is None:
         language = get_global_language()
+    return _build_tool_docstring(domain, tool_name, language)
 
+@lru_cache(maxsize=None)
+def _build_tool_docstring(domain: str, tool_name: str, language: str) -> str:
+    """Cached body of generate_tool_docstring; every toolkit instance asks
+    for the same docstrings. Cleared when a domain's descriptions change."""
     # If schema manager exists, prioritize using manager descriptions
     if domain in _schema_managers:
-        manager = _schema_managers[domain]
-        # Temporarily set language
-        original_language = manager.language_config
-        manager.set_language(language)
-        tool_desc = manager.get_tool_description(tool_name)
-        # Restore original language
-        manager.set_language(original_language)
+        tool_desc = _schema_managers[domain].get_tool_description(tool_name, language)
     else:
         tool_desc = get_tool_description(domain, tool_name)
 
@@ -188,6 +190,8 @@ class ToolSchemaManager:
         Args:
             language: Language setting ('chinese' or 'english')
         """
+        if language == self.language_config:
+            return
         self.language_config = language
         self._update_tool_type_mapping()
 
@@ -199,23 +203,30 @@ class ToolSchemaManager:
             "WRITE": "写入工具" if self.language_config == 'chinese' else "Write Tool"
         }
     
-    def get_tool_descriptions(self) -> Dict[str, Dict[str, Any]]:
-        """Get tool descriptions based on language configuration"""
-        if self.language_config == 'english':
+    def get_tool_descriptions(self, language: str = None) -> Dict[str, Dict[str, Any]]:
+        """Get tool descriptions based on language configuration
+
+        Args:
+            language: Language setting, if None then use the manager's language
+        """
+        if language is None:
+            language = self.language_config
+        if language == 'english':
             return self.descriptions_en
         else:
             return self.descriptions_zh
     
-    def get_tool_description(self, tool_name: str) -> Dict[str, Any]:
+    def get_tool_description(self, tool_name: str, language: str = None) -> Dict[str, Any]:
         """Get description of specific tool by name
         
         Args:
             tool_name: Tool name
+            language: Language setting, if None then use the manager's language
             
         Returns:
             Dictionary containing tool description, preconditions, postconditions, arguments, return value and tool type
         """
-        return self.get_tool_descriptions().get(tool_name, {})
+        return self.get_tool_descriptions(language).get(tool_name, {})
     
     def get_all_tool_names(self) -> list:
         """Get list of all available tool names
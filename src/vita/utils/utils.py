@@ -2,16 +2,23 @@ import re
 import hashlib
 import json
 import subprocess
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from deepdiff import DeepDiff
 from dotenv import load_dotenv
 from loguru import logger
-from thefuzz import fuzz, process
+from rapidfuzz import fuzz as rfuzz, process as rprocess
+from rapidfuzz.utils import default_process
+from thefuzz import fuzz
 from json_repair import repair_json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from vita.config import DEFAULT_LANGUAGE
 
 global_time = None
@@ -72,7 +79,23 @@ def get_now(format: str = "%Y%m%d_%H%M%S") -> str:
     return format_time(now, format=format)
 
 
+# Canonical "%Y-%m-%d %H:%M:%S" strings (zero padded, ASCII digits) can be
+# parsed by the C fromisoformat; strptime also accepts looser spellings such
+# as "2024-1-5 9:00:00", which still take the slow path.
+_CANONICAL_TIME_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}")
+
+
+def _is_canonical_time(time, format: str) -> bool:
+    return (
+        format == "%Y-%m-%d %H:%M:%S"
+        and isinstance(time, str)
+        and _CANONICAL_TIME_RE.fullmatch(time) is not None
+    )
+
+
 def str_to_datetime(time: str) -> datetime:
+    if _is_canonical_time(time, "%Y-%m-%d %H:%M:%S"):
+        return datetime.fromisoformat(time)
     return datetime.strptime(time, "%Y-%m-%d %H:%M:%S")
 
 def get_weekday(date: str, language: str = None) -> str:
@@ -98,6 +121,9 @@ def format_time(time: datetime, format: str = "%Y%m%d_%H%M%S") -> str:
 
 def check_time_format(time: str, format="%Y-%m-%d %H:%M:%S") -> bool:
     try:
+        if _is_canonical_time(time, format):
+            datetime.fromisoformat(time)
+            return True
         datetime.strptime(time, format)
         return True
     except ValueError:
@@ -157,7 +183,7 @@ def edit_distance_score(s1: str, s2: str):
     return 1 - dp[len(s1)][len(s2)] / max(len(s1), len(s2))
 
 
-def rerank(keywords: str, docs: Dict[str, str], with_score: bool = False):
+def rerank(keywords: str, docs: Dict[str, str], with_score: bool = False, top_k: Optional[int] = None):
     # Ensure there are no duplicate values in docs
     robust_docs = {}
     val_set = set()
@@ -169,14 +195,20 @@ def rerank(keywords: str, docs: Dict[str, str], with_score: bool = False):
         val_set.add(val)
         robust_docs[key] = val
 
-    candidates = [doc for doc in robust_docs.values()]
-    doc_dict_reverse = {val: key for key, val in robust_docs.items()}
-
-    docs_sorted = process.extract(keywords, candidates, limit=None, scorer=fuzz.partial_ratio)
+    keys = list(robust_docs)
+    # Same ranking as thefuzz's process.extract(scorer=fuzz.partial_ratio),
+    # but scored by rapidfuzz directly with its native default_process, which
+    # avoids thefuzz's Python processor call per candidate. Results come back
+    # in (score desc, index asc) order; thefuzz reports rounded scores.
+    # With top_k only the best top_k are selected instead of sorting them all.
+    docs_sorted = rprocess.extract(
+        keywords, list(robust_docs.values()), scorer=rfuzz.partial_ratio,
+        processor=default_process, limit=top_k,
+    )
     if with_score:
-        id_doc_sorted = [(doc_dict_reverse[doc], doc, score) for doc, score in docs_sorted]
+        id_doc_sorted = [(keys[idx], doc, int(round(score))) for doc, score, idx in docs_sorted]
     else:
-        id_doc_sorted = [(doc_dict_reverse[doc], doc) for doc, _ in docs_sorted]
+        id_doc_sorted = [(keys[idx], doc) for doc, _, idx in docs_sorted]
 
     return id_doc_sorted
 
@@ -195,6 +227,19 @@ def fuzzy_ratio_match(x: str, y: str) -> bool:
         return False
 
 
+def dumps_pretty_json(data) -> str:
+    """Render data as 2-space indented JSON with non-ASCII characters kept."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            # orjson.JSONEncodeError, e.g. integers beyond 64 bits.
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
 def json_check(json_str: str) -> bool:
     try:
         json.loads(json_str)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import check_reward_diff
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    for rel in [
+        "a.json",
+        "b.txt",
+        "sub/c.json",
+        "sub/run1/d.json",
+        "sub/run1/e.json.bak",
+        "other/run1/f.json",
+        "other/z/g.json",
+        ".hidden.json",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+    (tmp_path / "dir.json").mkdir()
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["*.json", "*.json*", "?.json", "sub/*.json", "**/run1/*.json", "run1/*", "**"],
+)
+def test_iter_json_files_matches_rglob(results_dir, pattern):
+    expected = [p for p in sorted(results_dir.rglob(pattern)) if p.is_file()]
+    assert list(check_reward_diff._iter_json_files(results_dir, pattern)) == expected
+
+
+def _sim(votes, **fields):
+    records = [{"vote": vote, "reason": "r"} for vote in votes]
+    return {**fields, "reward_info": {"info": {"judge_records": records}}}
+
+
+@pytest.mark.skipif(check_reward_diff.ijson is None, reason="ijson C backend not installed")
+def test_streaming_matches_in_memory(tmp_path, monkeypatch):
+    sims = [
+        _sim([1, 1, 1], task_id="t1"),
+        _sim([1, 0, "x", 1], task_id="t2"),
+        _sim([0, None, 2, 0], id="s3"),
+        _sim([], task_id="t4"),
+        _sim(["1", 0.0], id="s5", task_id=""),
+        {"id": "s6", "reward_info": None},
+        {"task_id": "t7", "reward_info": {"info": {"judge_records": [{"vote": 1}, {"vote": 0}]}}},
+        # task_id after reward_info must still be picked up.
+        {**_sim([0, 1]), "task_id": "t8"},
+    ]
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps({"simulations": sims}))
+
+    streamed = check_reward_diff._scan_file(path)
+    monkeypatch.setattr(check_reward_diff, "ijson", None)
+    assert check_reward_diff._scan_file(path) == streamed
+    assert streamed == (path, ["t2", "s5", "t7", "t8"])
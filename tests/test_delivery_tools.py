@@ -0,0 +1,47 @@
+import gc
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from vita.data_model.tasks import Location, ProductBaseModel, StoreBaseModel
+from vita.domains.delivery.environment import get_environment, get_tasks
+
+
+@pytest.fixture
+def tools():
+    for cls in (StoreBaseModel, ProductBaseModel, Location):
+        cls.clear_thread_data()
+    task = get_tasks("chinese")[0]
+    return get_environment(task.environment, language="chinese").tools
+
+
+def _order(tools, product, **kwargs):
+    db = tools.db
+    dispatch = datetime.strptime(db.time, "%Y-%m-%d %H:%M:%S") + timedelta(hours=1)
+    return tools.create_delivery_order(
+        user_id=db.user_id,
+        store_id=product.store_id,
+        product_ids=[product.product_id],
+        product_cnts=[2],
+        address=db.location[0].address,
+        dispatch_time=dispatch.strftime("%Y-%m-%d %H:%M:%S"),
+        **kwargs,
+    )
+
+
+def test_product_lookup_survives_a_rejected_order(tools):
+    product = next(iter(tools.db.stores.values())).products[0]
+    with pytest.raises(ValidationError):
+        _order(tools, product, note=123)
+    gc.collect()
+    assert tools._get_store_product(product.product_id) is product
+
+
+def test_ordered_products_are_validated(tools):
+    product = next(iter(tools.db.stores.values())).products[0]
+    _order(tools, product, attributes=[["大杯", "少冰"]])
+    ordered = list(tools.db.orders.values())[-1].products[0]
+    assert ordered.attributes == "大杯, 少冰"
+    assert ordered.quantity == 2
+    assert ordered.tags == product.tags and ordered.tags is not product.tags
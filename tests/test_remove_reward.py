@@ -0,0 +1,76 @@
+import pydantic_core
+import pytest
+
+import remove_reward
+
+
+def _results_file(tmp_path):
+    """A results file as Results.save writes it: pydantic-core, indent=4."""
+    results = {
+        "timestamp": "2026-01-01T00:00:00",
+        "info": {"num_trials": 1, "temperature": 1e-7, "simulations": []},
+        "tasks": [{"id": "t1", "environment": {"price": 1.5e300, "tags": []}}],
+        "simulations": [
+            {
+                "id": "s1",
+                "reward_info": {"reward": 0.5, "info": {"reward_info": 1}},
+                "messages": [
+                    {
+                        "content": "é \"q\" \\ \n\t\x01 😀 </a>",
+                        "reward_info": {"kept": True},
+                    }
+                ],
+                "duration": 12.25,
+            },
+            {"id": "s2", "messages": [], "cost": None, "big": 2**63 - 1},
+            {},
+            {"id": "s4", "reward_info": None},
+        ],
+    }
+    path = tmp_path / "results.json"
+    path.write_bytes(pydantic_core.to_json(results, indent=4))
+
+    for sim in results["simulations"]:
+        sim["reward_info"] = None
+    expected = pydantic_core.to_json(results, indent=4)
+    return path, expected
+
+
+@pytest.mark.skipif(remove_reward.ijson is None, reason="ijson C backend not installed")
+@pytest.mark.parametrize("use_msgspec", [True, False])
+def test_streaming_matches_in_memory(tmp_path, monkeypatch, use_msgspec):
+    if use_msgspec and remove_reward.msgspec is None:
+        pytest.skip("msgspec not installed")
+    if not use_msgspec:
+        monkeypatch.setattr(remove_reward, "msgspec", None)
+    in_path, expected = _results_file(tmp_path)
+
+    streamed = tmp_path / "streamed.json"
+    assert remove_reward._strip_rewards_streaming(in_path, streamed)
+    in_memory = tmp_path / "in_memory.json"
+    remove_reward._strip_rewards_in_memory(in_path, in_memory)
+
+    assert streamed.read_bytes() == in_memory.read_bytes()
+    assert in_memory.read_bytes() == expected
+
+
+@pytest.mark.skipif(remove_reward.ijson is None, reason="ijson C backend not installed")
+def test_streaming_rejects_non_results(tmp_path):
+    for i, doc in enumerate([b'{"tasks": []}', b'{"simulations": [1]}']):
+        in_path = tmp_path / f"in{i}.json"
+        in_path.write_bytes(doc)
+        out_path = tmp_path / f"out{i}.json"
+        with pytest.raises(ValueError):
+            remove_reward._strip_rewards_streaming(in_path, out_path)
+        with pytest.raises(ValueError):
+            remove_reward._strip_rewards_in_memory(in_path, out_path)
+        assert not out_path.exists()
+
+
+@pytest.mark.skipif(remove_reward.ijson is None, reason="ijson C backend not installed")
+def test_streaming_declines_big_integers(tmp_path):
+    in_path = tmp_path / "in.json"
+    in_path.write_bytes(b'{"simulations": [{"n": 100000000000000000000}]}')
+    out_path = tmp_path / "out.json"
+    assert not remove_reward._strip_rewards_streaming(in_path, out_path)
+    assert not out_path.exists()
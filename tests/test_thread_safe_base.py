@@ -0,0 +1,117 @@
+import gc
+import threading
+import weakref
+
+import pytest
+
+from vita.data_model.thread_safe_base import ThreadSafeBase
+
+
+class _Root(ThreadSafeBase["_Root"]):
+    def __init__(self, key: str):
+        self.key = key
+        self.register_instance()
+
+    def get_instance_key(self) -> str:
+        return self.key
+
+
+class _ChildA(_Root):
+    pass
+
+
+class _ChildB(_Root):
+    pass
+
+
+class _WeakRoot(ThreadSafeBase["_WeakRoot"]):
+    _registry_factory = weakref.WeakValueDictionary
+
+    def __init__(self, key: str):
+        self.key = key
+        self.register_instance()
+
+    def get_instance_key(self) -> str:
+        return self.key
+
+
+@pytest.fixture(autouse=True)
+def _clear_registries():
+    _Root.clear_thread_data()
+    _WeakRoot.clear_thread_data()
+    yield
+    _Root.clear_thread_data()
+    _WeakRoot.clear_thread_data()
+
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_subclasses_share_the_root_registry():
+    root, a, b = _Root("r"), _ChildA("a"), _ChildB("b")
+
+    assert _Root.get_all() == {"r": root, "a": a, "b": b}
+    assert _Root.get_all_polymorphic() == {"r": root, "a": a, "b": b}
+    # A subclass sees the whole hierarchy, not only its own instances.
+    assert _ChildA.get_all() is _Root.get_all()
+    assert _ChildB.get_all_polymorphic() is _Root.get_all()
+    # Separate hierarchies keep separate registries.
+    assert _WeakRoot.get_all() == {}
+
+
+def test_clearing_from_a_subclass_clears_the_hierarchy():
+    _Root("r")
+    _ChildA("a")
+    _ChildB.clear_all()
+    assert _Root.get_all() == {}
+
+
+def test_registries_are_isolated_between_threads():
+    main = _ChildA("main")
+
+    def other_thread():
+        seen = dict(_Root.get_all())
+        _ChildB("other")
+        _Root.clear_all()
+        _ChildA("after-clear")
+        return seen, set(_Root.get_all())
+
+    seen, other_keys = _in_thread(other_thread)
+    assert seen == {}
+    assert other_keys == {"after-clear"}
+    assert _Root.get_all() == {"main": main}
+
+
+def test_versions_change_on_register_and_clear():
+    v0 = _Root.get_registry_version()
+    _ChildA("a")
+    v1 = _Root.get_registry_version()
+    _Root.clear_all()
+    v2 = _Root.get_registry_version()
+    assert len({v0, v1, v2}) == 3
+    assert _in_thread(_Root.get_registry_version) not in {v0, v1, v2}
+
+
+def test_weak_entry_disappears_without_a_version_bump():
+    kept = _WeakRoot("kept")
+    dropped = _WeakRoot("dropped")
+    version = _WeakRoot.get_registry_version()
+
+    del dropped
+    gc.collect()
+
+    assert set(_WeakRoot.get_all()) == {"kept"}
+    assert _WeakRoot.get_all()["kept"] is kept
+    # Weak entries vanish silently; caches keyed on the version must not
+    # rely on it for registries that hold their instances weakly.
+    assert _WeakRoot.get_registry_version() == version
+
+
+def test_cleanup_thread_is_deprecated():
+    with pytest.warns(DeprecationWarning):
+        _Root.cleanup_thread()